@@ -3,20 +3,43 @@ Time-based GPIO Door Control System for Raspberry Pi 4b Physical Security
 Production-ready door control with three time-based modes and fail-safe behavior.
 """
 
+import copy
 import json
 import os
+import queue
 from datetime import datetime, time, timedelta
 from typing import Optional, Dict, Tuple, List
-from threading import Thread, Event, Lock
+from threading import Timer, Event, Lock, current_thread
+import time as time_module
+from functools import lru_cache
 import logging
-import traceback
 from ..config import DATA_DIR
 from ..logger import log_system, log_error
 
+# orjson ist deutlich schneller als stdlib json (relevant auf dem Pi) - optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 DOOR_CONTROL_FILE = os.path.join(DATA_DIR, "door_control.json")
 
+# Obergrenze für den Abstand zwischen zwei Timer-Läufen (Schutz gegen Uhrsprünge, z.B. NTP nach dem Boot)
+_MAX_TIMER_INTERVAL = 300
+
+# Index entspricht datetime.weekday() - ersetzt strftime("%A").lower()
+_WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+@lru_cache(maxsize=2048)
+def _parse_hm(value: str) -> time:
+    """Parse an HH:MM string into a time object (cached, only 1440 valid inputs)."""
+    return datetime.strptime(value, "%H:%M").time()
+
+
 class DoorControlManager:
     """
     Comprehensive time-based door control system with three modes:
@@ -31,8 +54,23 @@ class DoorControlManager:
         self.current_mode = "normal_operation"
         self.last_mode_change = None
         self.mode_lock = Lock()
-        self._monitoring_thread = None
+        # One-shot timer armed for the next mode boundary (replaces a polling thread)
+        self._timer: Optional[Timer] = None
+        self._timer_due = 0.0
+        self._timer_lock = Lock()
         self._stop_monitoring = Event()
+        # Persistence requests from API callers, handled by the boundary timer
+        self._work: "queue.SimpleQueue[str]" = queue.SimpleQueue()
+        self._last_err_sig: Optional[Tuple[str, str]] = None
+        self._err_repeat_count = 0
+        self._enabled = False
+        self._override_expires_dt: Optional[datetime] = None
+        self._mode_days: Dict[str, frozenset] = {}
+        # (monotonic second, cache generation, mode) - see get_current_mode
+        self._mode_cache_gen = 0
+        self._mode_cache: Tuple[int, int, str] = (-1, -1, "")
+        # Set by _determine_mode (under mode_lock), saved after the lock is released
+        self._save_pending = False
         self._load_config()
         self._start_monitoring()
 
@@ -40,8 +78,12 @@ class DoorControlManager:
         """Load door control configuration from JSON file."""
         try:
             if os.path.exists(DOOR_CONTROL_FILE):
-                with open(DOOR_CONTROL_FILE, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
+                if ORJSON_AVAILABLE:
+                    with open(DOOR_CONTROL_FILE, 'rb') as f:
+                        self.config = orjson.loads(f.read())
+                else:
+                    with open(DOOR_CONTROL_FILE, 'r', encoding='utf-8') as f:
+                        self.config = json.load(f)
                 log_system("Door control configuration loaded successfully")
             else:
                 # Default configuration - clean slate with no pre-configured times
@@ -85,80 +127,93 @@ class DoorControlManager:
             log_error(f"Error loading door control configuration: {str(e)}")
             self.config = {"enabled": False}
 
+        self._precompute_windows()
+
+    def _precompute_windows(self) -> None:
+        """Rebuild per-mode lookup structures after the configuration changed."""
+        self._invalidate_mode_cache()
+        self._enabled = bool(self.config.get("enabled", False))
+        self._override_expires_dt = self._parse_override_expiry()
+        try:
+            self._mode_days = {
+                mode_name: frozenset(mode_config.get("days", []))
+                for mode_name, mode_config in self.config.get("modes", {}).items()
+            }
+        except Exception as e:
+            log_error(f"Error precomputing door control windows: {str(e)}")
+            self._mode_days = {}
+
     def _save_config(self) -> bool:
-        """Save door control configuration to JSON file."""
+        """
+        Save door control configuration to JSON file.
+
+        Serializes a snapshot taken under mode_lock, so API calls changing
+        self.config meanwhile cannot break the dump; must not be called
+        with mode_lock held.
+        """
         try:
+            with self.mode_lock:
+                config = copy.deepcopy(self.config)
             os.makedirs(os.path.dirname(DOOR_CONTROL_FILE), exist_ok=True)
-            with open(DOOR_CONTROL_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            if ORJSON_AVAILABLE:
+                with open(DOOR_CONTROL_FILE, 'wb') as f:
+                    f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+            else:
+                with open(DOOR_CONTROL_FILE, 'w', encoding='utf-8') as f:
+                    json.dump(config, f, indent=2, ensure_ascii=False)
             log_system("Door control configuration saved successfully")
             return True
         except Exception as e:
             log_error(f"Error saving door control configuration: {str(e)}")
             return False
 
+    def _invalidate_mode_cache(self) -> None:
+        """Drop the memoized mode; entries computed before this call are never reused."""
+        self._mode_cache_gen += 1
+
+    def _parse_override_expiry(self) -> Optional[datetime]:
+        """Parse the stored override expiry once so mode checks can compare datetimes."""
+        expires = (self.config.get("override") or {}).get("expires")
+        if not expires:
+            return None
+        try:
+            return datetime.fromisoformat(expires)
+        except (TypeError, ValueError):
+            log_error(f"Invalid override expiry: {expires}")
+            return None
+
     def get_current_mode(self) -> str:
         """
         Determine current active mode based on time and configuration.
 
+        The result is memoized per monotonic second since the configured
+        windows only have minute resolution.
+
         Returns:
             str: "always_open", "normal_operation", or "access_blocked"
         """
+        if not self._enabled:
+            return "normal_operation"
+
+        now_s = int(time_module.monotonic())
+        gen = self._mode_cache_gen
+        cached_at, cached_gen, cached_mode = self._mode_cache
+        if cached_at == now_s and cached_gen == gen:
+            return cached_mode
+
         try:
             # Use timeout on lock to avoid deadlocks
             if self.mode_lock.acquire(timeout=5):
                 try:
-                    if not self.config.get("enabled", False):
-                        return "normal_operation"
-
-                    # Check for active override
-                    override = self.config.get("override", {})
-                    if override.get("active", False):
-                        expires = override.get("expires")
-                        if expires and datetime.fromisoformat(expires) > datetime.now():
-                            mode = override.get("mode", "normal_operation")
-                            log_system(f"Using override mode: {mode} (expires: {expires})")
-                            return mode
-                        else:
-                            # Override expired, clear it
-                            self.config["override"]["active"] = False
-                            self._save_config()
-
-                    current_time = datetime.now()
-                    current_weekday = current_time.strftime("%A").lower()
-
-                    # Check each mode to see if we're currently in its time window
-                    modes_config = self.config.get("modes", {})
-
-                    for mode_name, mode_config in modes_config.items():
-                        if not mode_config.get("enabled", False):
-                            continue
-
-                        if current_weekday not in mode_config.get("days", []):
-                            continue
-
-                        if self._is_time_in_window(
-                            current_time.time(),
-                            mode_config.get("start_time", "00:00"),
-                            mode_config.get("end_time", "23:59")
-                        ):
-                            if mode_name != self.current_mode:
-                                self.current_mode = mode_name
-                                self.last_mode_change = current_time
-                                log_system(f"Door mode changed to: {mode_name}")
-                                self._sync_gpio_state()
-                            return mode_name
-
-                    # Fallback to normal operation if no mode matches
-                    if self.current_mode != "normal_operation":
-                        self.current_mode = "normal_operation"
-                        self.last_mode_change = current_time
-                        log_system("Door mode defaulted to: normal_operation")
-                        self._sync_gpio_state()
-
-                    return "normal_operation"
+                    mode = self._determine_mode()
+                    self._mode_cache = (now_s, gen, mode)
+                    save_pending, self._save_pending = self._save_pending, False
                 finally:
                     self.mode_lock.release()
+                # _save_config takes mode_lock itself, so it may only run from here
+                if save_pending:
+                    self._request_save()
+                return mode
             else:
                 log_error("Failed to acquire mode lock within timeout")
                 return "normal_operation"
@@ -166,6 +221,59 @@ class DoorControlManager:
             log_error(f"Error determining current mode: {str(e)}")
             return "normal_operation"
 
+    def _determine_mode(self) -> str:
+        """Resolve the active mode from override and time windows (mode_lock must be held)."""
+        if not self.config.get("enabled", False):
+            return "normal_operation"
+
+        # Check for active override
+        override = self.config.get("override", {})
+        if override.get("active", False):
+            expires_dt = self._override_expires_dt
+            if expires_dt and expires_dt > datetime.now():
+                mode = override.get("mode", "normal_operation")
+                log_system(f"Using override mode: {mode} (expires: {override.get('expires')})")
+                return mode
+            else:
+                # Override expired, clear it
+                self.config["override"]["active"] = False
+                self._override_expires_dt = None
+                self._save_pending = True
+
+        current_time = datetime.now()
+        current_weekday = _WEEKDAY_NAMES[current_time.weekday()]
+
+        # Check each mode to see if we're currently in its time window
+        modes_config = self.config.get("modes", {})
+
+        for mode_name, mode_config in modes_config.items():
+            if not mode_config.get("enabled", False):
+                continue
+
+            if current_weekday not in self._mode_days.get(mode_name, ()):
+                continue
+
+            if self._is_time_in_window(
+                current_time.time(),
+                mode_config.get("start_time", "00:00"),
+                mode_config.get("end_time", "23:59")
+            ):
+                if mode_name != self.current_mode:
+                    self.current_mode = mode_name
+                    self.last_mode_change = current_time
+                    log_system(f"Door mode changed to: {mode_name}")
+                    self._sync_gpio_state()
+                return mode_name
+
+        # Fallback to normal operation if no mode matches
+        if self.current_mode != "normal_operation":
+            self.current_mode = "normal_operation"
+            self.last_mode_change = current_time
+            log_system("Door mode defaulted to: normal_operation")
+            self._sync_gpio_state()
+
+        return "normal_operation"
+
     def _is_time_in_window(self, check_time: time, start: str, end: str) -> bool:
         """
         Check if a time falls within a time window, handling overnight periods.
@@ -179,8 +287,8 @@ class DoorControlManager:
             bool: True if time is in window
         """
         try:
-            start_time = datetime.strptime(start, "%H:%M").time()
-            end_time = datetime.strptime(end, "%H:%M").time()
+            start_time = _parse_hm(start)
+            end_time = _parse_hm(end)
 
             if start_time <= end_time:
                 # Same day window (e.g., 08:00 - 16:00)
@@ -284,13 +392,13 @@ class DoorControlManager:
                 # Calculate next occurrence of this mode's start time
                 for day_offset in range(8):  # Check next 7 days
                     check_date = current_time.date() + timedelta(days=day_offset)
-                    check_weekday = check_date.strftime("%A").lower()
+                    check_weekday = _WEEKDAY_NAMES[check_date.weekday()]
 
-                    if check_weekday not in mode_config.get("days", []):
+                    if check_weekday not in self._mode_days.get(mode_name, ()):
                         continue
 
                     # Create datetime for the mode start time
-                    start_time = datetime.strptime(start_time_str, "%H:%M").time()
+                    start_time = _parse_hm(start_time_str)
                     mode_start_datetime = datetime.combine(check_date, start_time)
 
                     # Only consider future times
@@ -353,28 +461,112 @@ class DoorControlManager:
             log_error(f"Error synchronizing GPIO state: {str(e)}")
 
     def _start_monitoring(self) -> None:
-        """Start background thread for monitoring mode changes."""
-        if self._monitoring_thread is None or not self._monitoring_thread.is_alive():
-            self._stop_monitoring.clear()
-            self._monitoring_thread = Thread(target=self._monitoring_loop, daemon=True)
-            self._monitoring_thread.start()
-            log_system("Door control monitoring thread started")
-
-    def _monitoring_loop(self) -> None:
-        """Background monitoring loop for automatic mode transitions."""
-        while not self._stop_monitoring.is_set():
+        """Arm the boundary timer; the first run evaluates the mode immediately."""
+        self._stop_monitoring.clear()
+        self._schedule(0)
+        log_system("Door control boundary timer started")
+
+    def _schedule(self, delay: float) -> None:
+        """(Re)arm the boundary timer. A pending timer that fires earlier is kept."""
+        delay = max(0.0, delay)
+        due = time_module.monotonic() + delay
+        with self._timer_lock:
+            if self._stop_monitoring.is_set():
+                return
+            if self._timer is not None:
+                if self._timer_due <= due:
+                    return
+                self._timer.cancel()
+            timer = Timer(delay, self._on_boundary)
+            timer.daemon = True
+            self._timer = timer
+            self._timer_due = due
+            timer.start()
+
+    def _seconds_until_next_boundary(self) -> float:
+        """Seconds until the next mode start, mode end or override expiry."""
+        now = datetime.now()
+        candidates = [_MAX_TIMER_INTERVAL]
+
+        next_change = self.get_next_mode_change()
+        if next_change:
+            candidates.append(next_change["time_until_seconds"])
+
+        if self._enabled:
+            # Windows include their end minute, so the mode changes one minute later
+            for mode_config in self.config.get("modes", {}).values():
+                end_str = mode_config.get("end_time")
+                if not mode_config.get("enabled", False) or not end_str:
+                    continue
+                try:
+                    end_dt = datetime.combine(now.date(), _parse_hm(end_str)) + timedelta(minutes=1)
+                except ValueError:
+                    continue
+                if end_dt <= now:
+                    end_dt += timedelta(days=1)
+                candidates.append((end_dt - now).total_seconds())
+
+            if self.config.get("override", {}).get("active") and self._override_expires_dt:
+                candidates.append((self._override_expires_dt - now).total_seconds())
+
+        # Small margin so the timer fires just after the boundary, not before
+        return max(1.0, min(candidates) + 0.5)
+
+    def _request_save(self) -> None:
+        """Queue a config save for the boundary timer (saves inline after shutdown)."""
+        if self._stop_monitoring.is_set():
+            self._save_config()
+            return
+        self._work.put("save")
+        self._schedule(0)
+
+    def _process_work(self) -> None:
+        """
+        Drain queued work items and persist the config once if any save was requested.
+
+        A failed save is queued again and retried on the next boundary - the
+        API call that requested it has already reported success.
+        """
+        items = []
+        while True:
             try:
-                # Check current mode (this will trigger mode change if needed)
-                self.get_current_mode()
+                items.append(self._work.get_nowait())
+            except queue.Empty:
+                break
+        if "save" in items and not self._save_config():
+            self._work.put("save")
+
+    def _on_boundary(self) -> None:
+        """Timer callback: persist queued work, re-evaluate the mode, arm the next timer."""
+        with self._timer_lock:
+            if self._timer is current_thread():
+                self._timer = None
+        if self._stop_monitoring.is_set():
+            return
 
-                # Sleep for 30 seconds before next check
-                self._stop_monitoring.wait(30)
+        try:
+            self._process_work()
+            # A result memoized just before the boundary must not be reused
+            self._invalidate_mode_cache()
+            self.get_current_mode()
+            self._last_err_sig = None
+            delay = self._seconds_until_next_boundary()
 
-            except Exception as e:
-                log_error(f"Error in door control monitoring loop: {str(e)}")
-                log_error(traceback.format_exc())
-                # Sleep longer on error to prevent spam
-                self._stop_monitoring.wait(60)
+        except Exception as e:
+            # Only format the traceback once per distinct error
+            sig = (type(e).__name__, str(e))
+            if sig != self._last_err_sig:
+                self._last_err_sig = sig
+                self._err_repeat_count = 0
+                log_error(f"Error in door control boundary timer: {str(e)}")
+                logger.exception("Door control boundary timer failed")
+            else:
+                self._err_repeat_count += 1
+                log_error(f"Error in door control boundary timer repeated ({self._err_repeat_count}x): {sig[0]}")
+            # Retry later on error to prevent spam
+            delay = 60
+
+        self._schedule(delay)
 
     def set_override(self, mode: str, duration_hours: float) -> bool:
         """
@@ -395,19 +587,19 @@ class DoorControlManager:
         try:
             expires = datetime.now() + timedelta(hours=duration_hours)
 
-            self.config["override"] = {
-                "active": True,
-                "mode": mode,
-                "expires": expires.isoformat()
-            }
+            with self.mode_lock:
+                self.config["override"] = {
+                    "active": True,
+                    "mode": mode,
+                    "expires": expires.isoformat()
+                }
+                self._override_expires_dt = expires
+                self._invalidate_mode_cache()
 
-            if self._save_config():
-                log_system(f"Door mode override set: {mode} for {duration_hours} hours")
-                # Trigger immediate mode check
-                self.get_current_mode()
-                return True
-            else:
-                return False
+            # Persisting and the follow-up mode check run on the boundary timer
+            self._request_save()
+            log_system(f"Door mode override set: {mode} for {duration_hours} hours")
+            return True
 
         except Exception as e:
             log_error(f"Error setting mode override: {str(e)}")
@@ -416,14 +608,14 @@ class DoorControlManager:
     def clear_override(self) -> bool:
         """Clear any active mode override."""
         try:
-            self.config["override"]["active"] = False
-            if self._save_config():
-                log_system("Door mode override cleared")
-                # Trigger immediate mode check
-                self.get_current_mode()
-                return True
-            else:
-                return False
+            with self.mode_lock:
+                self.config["override"]["active"] = False
+                self._override_expires_dt = None
+                self._invalidate_mode_cache()
+
+            self._request_save()
+            log_system("Door mode override cleared")
+            return True
         except Exception as e:
             log_error(f"Error clearing mode override: {str(e)}")
             return False
@@ -485,14 +677,13 @@ class DoorControlManager:
             if not self._validate_config(new_config):
                 return False
 
-            self.config.update(new_config)
-            if self._save_config():
-                log_system("Door control configuration updated successfully")
-                # Trigger immediate mode check with new config
-                self.get_current_mode()
-                return True
-            else:
-                return False
+            with self.mode_lock:
+                self.config.update(new_config)
+                self._precompute_windows()
+
+            self._request_save()
+            log_system("Door control configuration updated successfully")
+            return True
 
         except Exception as e:
             log_error(f"Error updating door control configuration: {str(e)}")
@@ -513,7 +704,7 @@ class DoorControlManager:
                         for time_field in ["start_time", "end_time"]:
                             if time_field in mode_config:
                                 try:
-                                    datetime.strptime(mode_config[time_field], "%H:%M")
+                                    _parse_hm(mode_config[time_field])
                                 except ValueError:
                                     log_error(f"Invalid time format in {mode_name}.{time_field}: {mode_config[time_field]}")
                                     return False
@@ -534,8 +725,15 @@ class DoorControlManager:
             log_system("Shutting down door control manager")
             self._stop_monitoring.set()
 
-            if self._monitoring_thread and self._monitoring_thread.is_alive():
-                self._monitoring_thread.join(timeout=5)
+            with self._timer_lock:
+                timer, self._timer = self._timer, None
+            if timer is not None:
+                timer.cancel()
+                if timer.is_alive() and timer is not current_thread():
+                    timer.join(timeout=5)
+
+            # Flush saves that were queued but not yet processed
+            self._process_work()
 
             log_system("Door control manager shutdown completed")
         except Exception as e:
@@ -546,13 +744,13 @@ door_control_manager = DoorControlManager()
 
 # Initialize door state on system startup
 def initialize_door_control():
-    """Initialize door control system on startup."""
+    """Initialize door control system on startup (no-op if already loaded)."""
     try:
+        # The singleton already loaded its config in __init__ - avoid a second parse
+        if door_control_manager.config:
+            return
         # Just load config, don't sync GPIO to avoid lock contention at startup
         door_control_manager._load_config()
         log_system("Door control system initialized successfully")
     except Exception as e:
         log_error(f"Error initializing door control system: {str(e)}")
-
-# Call initialization when module is imported
-initialize_door_control()
\ No newline at end of file
@@ -5,18 +5,112 @@ This is a production-ready, simplified version that avoids the complex
 threading and locking issues that were causing worker timeouts.
 """
 
+import bisect
+import copy
+from collections import namedtuple
 import json
 import os
-from datetime import datetime, time
-from typing import Dict, Optional
-from threading import Thread, Event
+from datetime import datetime, time, timedelta
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+from threading import Thread, Event, Lock
 import time as time_module
 
 from ..logger import log_system, log_error
 from ..config import DATA_DIR
 
+# orjson ist deutlich schneller als stdlib json (relevant auf dem Pi) - optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Bound once at import instead of re-importing on every mode check
+try:
+    from ..gpio_control import set_gpio_state, get_gpio_state
+except ImportError as e:
+    log_error(f"GPIO control module not available for door control: {e}")
+    set_gpio_state = get_gpio_state = None
+
 DOOR_CONTROL_FILE = os.path.join(DATA_DIR, "door_control.json")
 
+# Verbose per-mode decision logging - every access check would otherwise write several log lines
+DEBUG_MODE_CHECKS = os.getenv('DOOR_CONTROL_DEBUG', 'false').lower() == 'true'
+
+def _loads_config(data: bytes) -> Dict:
+    """Parse door_control.json contents."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_config(config: Dict) -> bytes:
+    """Serialize the config as indented UTF-8 JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    return json.dumps(config, indent=2).encode("utf-8")
+
+
+class _FrozenDict(dict):
+    """
+    Read-only dict for shared status snapshots.
+
+    Still a dict subclass, so json/jsonify serialize it like a plain dict
+    (MappingProxyType would not serialize); every mutator raises TypeError.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("door control status snapshots are read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def copy(self) -> Dict:
+        """Return a mutable shallow copy."""
+        return dict(self)
+
+    def __reduce__(self):
+        # copy/deepcopy/pickle rebuild through the constructor, not item assignment
+        return (_FrozenDict, (dict(self),))
+
+
+def _freeze(value):
+    """Recursively convert dicts/lists into _FrozenDict/tuples."""
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# One mode's time window as precomputed by _compile_modes
+# (start_min/end_min are minutes since midnight, day_mask bit 0 = monday)
+CompiledMode = namedtuple("CompiledMode", "enabled start_min end_min day_mask name")
+
+
+# Manual "mode" settings and the door mode each one forces
+_MANUAL_MODE_MAP = {
+    "always_normal": "normal_operation",
+    "always_open": "always_open",
+    "always_closed": "access_blocked",
+}
+
+# Index matches datetime.weekday(); day masks use bit (1 << index)
+_WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+_NAME_TO_IDX = {name: idx for idx, name in enumerate(_WEEKDAY_NAMES)}
+
+# Upper bound for one monitoring sleep - picks up config files written by other
+# workers and survives wall-clock jumps (e.g. NTP sync after boot)
+_MAX_MONITOR_INTERVAL = 300
+
+# Parsed door_control.json keyed by st_mtime_ns - skips json parsing when the file is unchanged
+# ("data" is always a private copy: loads copy out of it, saves copy into it)
+_CONFIG_CACHE = {"mtime_ns": 0, "data": None}
+
 class SimpleDoorControlManager:
     """Simplified door control manager without complex threading."""
 
@@ -26,6 +120,24 @@ class SimpleDoorControlManager:
         self.last_mode_change = datetime.now()
         self._monitoring_thread = None
         self._stop_monitoring = Event()
+        # Set to wake the monitoring loop early (config change, shutdown)
+        self._wakeup = Event()
+        # Last logged mode setting - the setting line is only logged when it changes
+        self._last_logged_setting = None
+        # Compiled time windows in config order, rebuilt by _compile_modes
+        self._compiled_modes: List[CompiledMode] = []
+        # Enabled modes' (start_min, name, day_mask) sorted by start, plus parallel start keys for bisect
+        self._sorted_starts: List[Tuple[int, str, int]] = []
+        self._sorted_starts_keys: List[int] = []
+        # Memoized get_current_mode result: ((minute, setting, enabled, config_gen), mode)
+        self._config_gen = 0
+        self._mode_cache = None
+        # GPIO level last written successfully - None forces the next sync
+        self._last_synced_high: Optional[bool] = None
+        # get_status response reused within the same second: (key, status)
+        self._status_cache = None
+        # Frozen copy of config["modes"] for status responses, rebuilt by _compile_modes
+        self._modes_snapshot: Mapping = _FrozenDict()
         self._load_config()
         # Immediately sync GPIO state on initialization
         self.get_current_mode()
@@ -36,8 +148,15 @@ class SimpleDoorControlManager:
         """Load door control configuration from file."""
         try:
             if os.path.exists(DOOR_CONTROL_FILE):
-                with open(DOOR_CONTROL_FILE, 'r') as f:
-                    self.config = json.load(f)
+                mtime_ns = os.stat(DOOR_CONTROL_FILE).st_mtime_ns
+                if mtime_ns == _CONFIG_CACHE["mtime_ns"] and _CONFIG_CACHE["data"] is not None:
+                    self.config = copy.deepcopy(_CONFIG_CACHE["data"])
+                else:
+                    with open(DOOR_CONTROL_FILE, 'rb') as f:
+                        self.config = _loads_config(f.read())
+                    _CONFIG_CACHE["mtime_ns"] = mtime_ns
+                    # The cache mirrors the file, never the live (mutated in place) config
+                    _CONFIG_CACHE["data"] = copy.deepcopy(self.config)
 
                 # CRITICAL FIX: Ensure "mode" field exists, default to "always_normal" if missing
                 if "mode" not in self.config:
@@ -55,6 +174,59 @@ class SimpleDoorControlManager:
             log_error(f"Error loading door control config: {str(e)}")
             self.config = self._get_default_config()
 
+        self._compile_modes()
+
+    def _compile_modes(self) -> None:
+        """Parse each mode's time window once so mode checks skip strptime."""
+        # Invalidates memoized get_current_mode results
+        self._config_gen += 1
+        compiled = []
+        for mode_name, mode_config in self.config.get("modes", {}).items():
+            start_str = mode_config.get("start_time", "00:00")
+            end_str = mode_config.get("end_time", "23:59")
+            try:
+                start_time = datetime.strptime(start_str, "%H:%M").time()
+                end_time = datetime.strptime(end_str, "%H:%M").time()
+            except (TypeError, ValueError) as e:
+                log_error(f"Error parsing time window {start_str}-{end_str}: {e}")
+                continue
+            compiled.append(CompiledMode(
+                enabled=bool(mode_config.get("enabled", False)),
+                start_min=start_time.hour * 60 + start_time.minute,
+                end_min=end_time.hour * 60 + end_time.minute,
+                day_mask=self._days_to_mask(mode_config.get("days", [])),
+                name=mode_name,
+            ))
+        self._compiled_modes = compiled
+        self._sorted_starts = sorted((m.start_min, m.name, m.day_mask) for m in compiled if m.enabled)
+        self._sorted_starts_keys = [entry[0] for entry in self._sorted_starts]
+        self._modes_snapshot = _freeze(self.config.get("modes", {}))
+
+    @staticmethod
+    def _format_minute(minute: int) -> str:
+        """Format minutes since midnight as HH:MM."""
+        return f"{minute // 60:02d}:{minute % 60:02d}"
+
+    @staticmethod
+    def _days_to_mask(days) -> int:
+        """Convert a list of weekday names into a 7-bit mask (bit 0 = monday)."""
+        mask = 0
+        for day in days:
+            idx = _NAME_TO_IDX.get(day)
+            if idx is not None:
+                mask |= 1 << idx
+        return mask
+
+    def _refresh_config_if_changed(self) -> None:
+        """Reload the configuration if door_control.json was rewritten (e.g. by another worker)."""
+        try:
+            mtime_ns = os.stat(DOOR_CONTROL_FILE).st_mtime_ns
+        except OSError:
+            return
+        if mtime_ns != _CONFIG_CACHE["mtime_ns"]:
+            log_system("Door control configuration changed on disk - reloading")
+            self._load_config()
+
     def _get_default_config(self) -> Dict:
         """Get default door control configuration."""
         return {
@@ -89,28 +261,23 @@ class SimpleDoorControlManager:
         """Save configuration to file."""
         try:
             os.makedirs(os.path.dirname(DOOR_CONTROL_FILE), exist_ok=True)
-            with open(DOOR_CONTROL_FILE, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            payload = _dumps_config(self.config)
+
+            # Temporäre Datei + ein einziger write(), dann atomare Umbenennung -
+            # ein Stromausfall hinterlässt nie eine halb geschriebene Konfiguration
+            temp_file = DOOR_CONTROL_FILE + '.tmp'
+            with open(temp_file, 'wb', buffering=64 * 1024) as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, DOOR_CONTROL_FILE)
+            _CONFIG_CACHE["mtime_ns"] = os.stat(DOOR_CONTROL_FILE).st_mtime_ns
+            _CONFIG_CACHE["data"] = copy.deepcopy(self.config)
             return True
         except Exception as e:
             log_error(f"Error saving door control config: {str(e)}")
             return False
 
-    def _is_time_in_window(self, current_time: time, start_str: str, end_str: str) -> bool:
-        """Check if current time is within the specified window."""
-        try:
-            start_time = datetime.strptime(start_str, "%H:%M").time()
-            end_time = datetime.strptime(end_str, "%H:%M").time()
-
-            # Handle overnight windows (e.g., 22:00 to 06:00)
-            if start_time > end_time:
-                return current_time >= start_time or current_time <= end_time
-            else:
-                return start_time <= current_time <= end_time
-        except Exception as e:
-            log_error(f"Error parsing time window {start_str}-{end_str}: {e}")
-            return False
-
     def get_current_mode(self) -> str:
         """
         Determine current active mode based on time and configuration.
@@ -119,73 +286,103 @@ class SimpleDoorControlManager:
             str: "always_open", "normal_operation", or "access_blocked"
         """
         try:
-            if not self.config.get("enabled", False):
+            # Single clock sample for the whole check
+            now = datetime.now()
+
+            # Modes can only change on minute boundaries - reuse the result within a minute
+            cache_key = (
+                now.replace(second=0, microsecond=0),
+                self.config.get("mode", "time_based"),
+                self.config.get("enabled", False),
+                self._config_gen,
+            )
+            cached = self._mode_cache
+            if cached is not None and cached[0] == cache_key:
+                self._sync_gpio_state()  # no-op unless the GPIO level is out of date
+                return cached[1]
+
+            mode = self._determine_mode(now)
+            self._mode_cache = (cache_key, mode)
+            return mode
+
+        except Exception as e:
+            log_error(f"Error in get_current_mode: {str(e)}")
+            return "normal_operation"
+
+    def _determine_mode(self, now: datetime) -> str:
+        """Resolve the active mode at ``now`` from the mode setting and the time windows."""
+        if not self.config.get("enabled", False):
+            if self._last_logged_setting != "disabled":
+                self._last_logged_setting = "disabled"
                 log_system("Door control disabled - defaulting to normal_operation")
-                return "normal_operation"
+            return "normal_operation"
 
-            # Check if we have a manual mode override
-            manual_mode = self.config.get("mode", "time_based")
+        # Check if we have a manual mode override
+        manual_mode = self.config.get("mode", "time_based")
+        if manual_mode != self._last_logged_setting:
+            self._last_logged_setting = manual_mode
             log_system(f"Door control mode setting: {manual_mode}")
 
-            # Handle manual mode overrides
-            if manual_mode == "always_normal":
-                self.current_mode = "normal_operation"
-                self._sync_gpio_state()
-                return "normal_operation"
-            elif manual_mode == "always_open":
-                self.current_mode = "always_open"
-                self._sync_gpio_state()
-                return "always_open"
-            elif manual_mode == "always_closed":
-                self.current_mode = "access_blocked"
-                self._sync_gpio_state()
-                return "access_blocked"
-
-            # Time-based mode logic
-            current_time = datetime.now()
-            current_weekday = current_time.strftime("%A").lower()
-            log_system(f"Time-based mode check - Current: {current_time.strftime('%H:%M')} on {current_weekday}")
+        # Handle manual mode overrides
+        mapped = _MANUAL_MODE_MAP.get(manual_mode)
+        if mapped is not None:
+            if self.current_mode != mapped:
+                self.current_mode = mapped
+                self.last_mode_change = now
+            self._sync_gpio_state()
+            return mapped
+
+        # Time-based mode logic
+        now_min = now.hour * 60 + now.minute
+        wd = now.weekday()
+        # Debug lines are collected and written as a single log entry
+        debug_msgs: Optional[List[str]] = [] if DEBUG_MODE_CHECKS else None
+        try:
+            if debug_msgs is not None:
+                debug_msgs.append(f"Time-based mode check - Current: {now:%H:%M} on {_WEEKDAY_NAMES[wd]}")
 
             # Check each mode to see if we're currently in its time window
-            modes_config = self.config.get("modes", {})
-
-            for mode_name, mode_config in modes_config.items():
-                if not mode_config.get("enabled", False):
-                    log_system(f"Mode '{mode_name}' is DISABLED - skipping")
+            for m in self._compiled_modes:
+                if not m.enabled:
+                    if debug_msgs is not None:
+                        debug_msgs.append(f"Mode '{m.name}' is DISABLED - skipping")
                     continue
 
-                if current_weekday not in mode_config.get("days", []):
-                    log_system(f"Mode '{mode_name}' not active on {current_weekday} - skipping")
+                if not (m.day_mask >> wd) & 1:
+                    if debug_msgs is not None:
+                        debug_msgs.append(f"Mode '{m.name}' not active on {_WEEKDAY_NAMES[wd]} - skipping")
                     continue
 
-                start_time = mode_config.get("start_time", "00:00")
-                end_time = mode_config.get("end_time", "23:59")
-
-                if self._is_time_in_window(current_time.time(), start_time, end_time):
-                    log_system(f"✅ Mode '{mode_name}' is ACTIVE ({start_time}-{end_time})")
+                # Overnight windows (e.g. 22:00 to 06:00) wrap around midnight
+                start, end = m.start_min, m.end_min
+                in_window = (start <= now_min <= end) if start <= end else (now_min >= start or now_min <= end)
+                if in_window:
+                    if debug_msgs is not None:
+                        debug_msgs.append(f"✅ Mode '{m.name}' is ACTIVE "
+                                          f"({self._format_minute(start)}-{self._format_minute(end)})")
                     # Always sync GPIO when we determine the mode, even if mode hasn't changed
                     # This ensures GPIO state is correct after service restarts or config changes
-                    if mode_name != self.current_mode:
-                        self.current_mode = mode_name
-                        self.last_mode_change = current_time
-                        log_system(f"🔄 Door mode CHANGED to: {mode_name}")
+                    if m.name != self.current_mode:
+                        self.current_mode = m.name
+                        self.last_mode_change = now
+                        log_system(f"🔄 Door mode CHANGED to: {m.name}")
                     self._sync_gpio_state()
-                    return mode_name
-                else:
-                    log_system(f"Mode '{mode_name}' outside time window ({start_time}-{end_time})")
+                    return m.name
+                elif debug_msgs is not None:
+                    debug_msgs.append(f"Mode '{m.name}' outside time window "
+                                      f"({self._format_minute(start)}-{self._format_minute(end)})")
 
             # Fallback to normal operation if no mode matches
             if self.current_mode != "normal_operation":
                 self.current_mode = "normal_operation"
-                self.last_mode_change = current_time
+                self.last_mode_change = now
                 log_system("Door mode defaulted to: normal_operation")
             self._sync_gpio_state()  # Always sync GPIO state
 
             return "normal_operation"
-
-        except Exception as e:
-            log_error(f"Error in get_current_mode: {str(e)}")
-            return "normal_operation"
+        finally:
+            if debug_msgs:
+                log_system(" | ".join(debug_msgs))
 
     def should_gpio_be_high(self) -> bool:
         """
@@ -202,11 +399,16 @@ class SimpleDoorControlManager:
             return False
 
     def _sync_gpio_state(self) -> None:
-        """Synchronize GPIO state with current mode."""
-        try:
-            from ..gpio_control import set_gpio_state
+        """Synchronize GPIO state with current mode (skipped if already in sync)."""
+        desired_high = self.current_mode == "always_open"
+        if desired_high == self._last_synced_high:
+            return
+
+        if set_gpio_state is None:
+            return
 
-            if self.current_mode == "always_open":
+        try:
+            if desired_high:
                 success = set_gpio_state(True)  # Set HIGH
                 if success:
                     log_system("🟢 GPIO set to HIGH for always_open mode")
@@ -218,18 +420,28 @@ class SimpleDoorControlManager:
                     log_system("🔴 GPIO set to LOW for normal/blocked mode")
                 else:
                     log_error("❌ Failed to set GPIO LOW")
+            self._last_synced_high = desired_high if success else None
 
         except Exception as e:
             log_error(f"Error syncing GPIO state: {str(e)}")
 
-    def get_config(self) -> Dict:
-        """Get current configuration."""
-        return self.config.copy()
+    def get_config(self) -> Mapping:
+        """Get a read-only view of the current configuration (use update_config to change it)."""
+        return MappingProxyType(self.config)
+
+    def get_config_copy(self) -> Dict:
+        """Get an independent deep copy of the current configuration."""
+        return copy.deepcopy(self.config)
 
     def update_config(self, new_config: Dict) -> bool:
         """Update configuration."""
         try:
             self.config.update(new_config)
+            self._compile_modes()
+            # Force one GPIO write after admin changes
+            self._last_synced_high = None
+            # Let the monitoring loop recompute its next boundary
+            self._wakeup.set()
             self._save_config()
             log_system("Door control configuration updated")
             # Immediately sync GPIO state after config update
@@ -251,29 +463,41 @@ class SimpleDoorControlManager:
         # The GPIO pulse will still be triggered for QR scans in Mode 3
         return True  # Always return True for fail-safe emergency exit
 
-    def get_status(self) -> Dict:
-        """Get comprehensive door control status."""
+    def get_status(self) -> Mapping:
+        """
+        Get comprehensive door control status (rebuilt at most once per second).
+
+        The result is a shared read-only snapshot (JSON-serializable like a
+        dict); use .copy() for a mutable version.
+        """
         current_mode = self.get_current_mode()
+        cache_key = (current_mode, self._last_synced_high, self._config_gen, int(time_module.time()))
+        cached = self._status_cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
         next_change = self.get_next_mode_change()
 
-        try:
-            from ..gpio_control import get_gpio_state
-            gpio_status = get_gpio_state()
-            gpio_state = "HIGH" if gpio_status.get("state") == 1 else "LOW"
-        except Exception as e:
-            log_error(f"Error getting GPIO state: {str(e)}")
-            gpio_state = "UNKNOWN"
+        gpio_state = "UNKNOWN"
+        if get_gpio_state is not None:
+            try:
+                gpio_status = get_gpio_state()
+                gpio_state = "HIGH" if gpio_status.get("state") == 1 else "LOW"
+            except Exception as e:
+                log_error(f"Error getting GPIO state: {str(e)}")
 
-        return {
+        status = _FrozenDict({
             "enabled": self.config.get("enabled", False),
             "mode": self.config.get("mode", "time_based"),
             "current_mode": current_mode,
             "gpio_state": gpio_state,
             "next_change": next_change,
             "last_mode_change": self.last_mode_change.isoformat() if self.last_mode_change else None,
-            "modes_config": self.config.get("modes", {}),
+            "modes_config": self._modes_snapshot,
             "timestamp": datetime.now().isoformat()
-        }
+        })
+        self._status_cache = (cache_key, status)
+        return status
 
     def _get_mode_display_name(self, mode_name: str) -> str:
         """Translate internal mode name to German display name."""
@@ -287,27 +511,24 @@ class SimpleDoorControlManager:
     def get_next_mode_change(self) -> Optional[str]:
         """Get description of next mode change (simplified version)."""
         try:
-            current_time = datetime.now()
-            current_weekday = current_time.strftime("%A").lower()
-
-            # Find the next time change today
-            times = []
-            for mode_name, mode_config in self.config.get("modes", {}).items():
-                if mode_config.get("enabled", False) and current_weekday in mode_config.get("days", []):
-                    start_time = datetime.strptime(mode_config.get("start_time", "00:00"), "%H:%M").time()
-                    times.append((start_time, mode_name))
-
-            times.sort()
-
-            for time_obj, mode_name in times:
-                if time_obj > current_time.time():
+            now = datetime.now()
+            now_min = now.hour * 60 + now.minute
+            wd = now.weekday()
+
+            # Find the next time change today - starts are presorted by _compile_modes
+            starts = self._sorted_starts
+            for idx in range(bisect.bisect_right(self._sorted_starts_keys, now_min), len(starts)):
+                start_min, mode_name, day_mask = starts[idx]
+                if (day_mask >> wd) & 1:
                     mode_display = self._get_mode_display_name(mode_name)
-                    return f"{time_obj.strftime('%H:%M')} - {mode_display}"
+                    return f"{self._format_minute(start_min)} - {mode_display}"
 
             # Next change is tomorrow
-            if times:
-                mode_display = self._get_mode_display_name(times[0][1])
-                return f"Morgen {times[0][0].strftime('%H:%M')} - {mode_display}"
+            tomorrow = (wd + 1) % 7
+            for start_min, mode_name, day_mask in starts:
+                if (day_mask >> tomorrow) & 1:
+                    mode_display = self._get_mode_display_name(mode_name)
+                    return f"Morgen {self._format_minute(start_min)} - {mode_display}"
 
             return None
 
@@ -315,6 +536,26 @@ class SimpleDoorControlManager:
             log_error(f"Error calculating next mode change: {str(e)}")
             return None
 
+    def _compute_next_transition_datetime(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """Return the next instant after now (default: current time) at which the time-based mode can change."""
+        if not self.config.get("enabled", False) or self.config.get("mode", "time_based") != "time_based":
+            return None
+
+        if now is None:
+            now = datetime.now()
+        midnight = datetime.combine(now.date(), time(0, 0))
+        # Weekday membership changes at midnight
+        candidates = [midnight + timedelta(days=1)]
+        for m in self._compiled_modes:
+            if not m.enabled:
+                continue
+            for day_offset in (0, 1440):
+                candidates.append(midnight + timedelta(minutes=day_offset + m.start_min))
+                # Windows include their end minute
+                candidates.append(midnight + timedelta(minutes=day_offset + m.end_min + 1))
+
+        return min(dt for dt in candidates if dt > now)
+
     def _start_monitoring(self) -> None:
         """Start background thread for monitoring mode changes and GPIO sync."""
         if self._monitoring_thread is None or not self._monitoring_thread.is_alive():
@@ -326,23 +567,44 @@ class SimpleDoorControlManager:
     def _monitoring_loop(self) -> None:
         """Background monitoring loop for automatic mode transitions and GPIO sync."""
         while not self._stop_monitoring.is_set():
+            # Deadlines are tracked on the monotonic clock so wall-clock jumps
+            # (NTP, timezone changes) cannot stall or thrash the loop. Both clocks
+            # are read once, before the work, so its duration is not slept again.
+            tick = time_module.monotonic()
+            wall_now = datetime.now()
             try:
+                self._wakeup.clear()
+
+                # Pick up config changes written by other worker processes
+                self._refresh_config_if_changed()
+
+                # Re-assert the GPIO level once per wakeup in case it was changed externally
+                self._last_synced_high = None
+
                 # Check current mode (this will trigger GPIO sync)
                 self.get_current_mode()
 
-                # Sleep for 30 seconds before next check
-                self._stop_monitoring.wait(30)
+                # Sleep until the next mode boundary (or a config change wakes us)
+                timeout = _MAX_MONITOR_INTERVAL
+                next_dt = self._compute_next_transition_datetime(wall_now)
+                if next_dt is not None:
+                    seconds = (next_dt - wall_now).total_seconds() + 0.5
+                    timeout = max(1.0, min(timeout, seconds))
+                deadline = tick + timeout
+                self._wakeup.wait(max(0.0, deadline - time_module.monotonic()))
 
             except Exception as e:
                 log_error(f"Error in door control monitoring loop: {str(e)}")
                 # Sleep longer on error to prevent spam
-                self._stop_monitoring.wait(60)
+                deadline = tick + 60
+                self._stop_monitoring.wait(max(0.0, deadline - time_module.monotonic()))
 
     def shutdown(self) -> None:
         """Shutdown the door control manager and cleanup resources."""
         try:
             log_system("Shutting down door control manager")
             self._stop_monitoring.set()
+            self._wakeup.set()
 
             if self._monitoring_thread and self._monitoring_thread.is_alive():
                 self._monitoring_thread.join(timeout=5)
@@ -352,5 +614,23 @@ class SimpleDoorControlManager:
             log_error(f"Error during door control manager shutdown: {str(e)}")
 
 
-# Create singleton instance
-simple_door_control_manager = SimpleDoorControlManager()
\ No newline at end of file
+# Singleton - created on first use instead of at import time
+_instance: Optional[SimpleDoorControlManager] = None
+_instance_lock = Lock()
+
+
+def get_simple_door_control_manager() -> SimpleDoorControlManager:
+    """Return the process-wide door control manager, creating it on first use."""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = SimpleDoorControlManager()
+    return _instance
+
+
+def __getattr__(name: str):
+    # Backwards compatibility: `from ... import simple_door_control_manager`
+    if name == "simple_door_control_manager":
+        return get_simple_door_control_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
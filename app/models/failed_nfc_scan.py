@@ -1,11 +1,142 @@
 import sqlite3
 import os
 import json
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterator, Sequence
 from ..config import DATA_DIR
 from ..logger import log_system, log_error
 
+# orjson ist deutlich schneller als stdlib json (relevant auf dem Pi) - optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps_json(obj: Any) -> str:
+    """Serialisiert obj kompakt für die JSON-TEXT-Spalten."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"))
+
+
+# Insert-Statements als Modulkonstanten: gleicher SQL-Text bei jedem Aufruf,
+# damit der Statement-Cache der Verbindung die vorbereiteten Statements wiederverwendet
+_SQL_INSERT_SCAN = """
+    INSERT INTO failed_scans 
+    (timestamp, card_type, attempted_aids, total_commands, 
+     successful_commands, error_summary, raw_atr_data, uid_data, analysis_notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_APDU = """
+    INSERT INTO apdu_responses 
+    (scan_id, command_sequence, command_name, command_apdu, 
+     response_apdu, sw1, sw2, success, error_message, execution_time_ms)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Hintergrund-Wartung: WAL-Checkpoint, PRAGMA optimize und Archivierung
+_MAINTENANCE_INTERVAL = 15 * 60  # Sekunden
+_ARCHIVE_AFTER_DAYS = 90
+
+# Präfixe der Command-Namen, deren APDU eine AID-Selektion ist
+# (z.B. "select_german_aid_A0000001523010")
+_AID_COMMAND_PREFIXES = ("select", "aid")
+
+# Explizite Spaltenlisten statt SELECT * - dienen gleichzeitig als Allow-List
+# für die frei wählbaren Spalten in get_failed_scans
+_SCAN_COLUMNS = (
+    "id", "timestamp", "card_type", "attempted_aids", "total_commands",
+    "successful_commands", "error_summary", "raw_atr_data", "uid_data",
+    "analysis_notes", "created_at", "success_rate",
+)
+_APDU_COLUMNS = (
+    "id", "scan_id", "command_sequence", "command_name", "command_apdu",
+    "response_apdu", "sw1", "sw2", "success", "error_message",
+    "execution_time_ms", "created_at",
+)
+
+# Generierte Spalten gibt es erst ab SQLite 3.31 - ältere System-SQLite berechnet
+# success_rate stattdessen in jeder Abfrage
+_SQLITE_HAS_GENERATED_COLUMNS = sqlite3.sqlite_version_info >= (3, 31, 0)
+_SUCCESS_RATE_EXPR = "CAST(successful_commands AS REAL) / NULLIF(total_commands, 0)"
+_SQL_SUCCESS_RATE = "success_rate" if _SQLITE_HAS_GENERATED_COLUMNS else f"({_SUCCESS_RATE_EXPR})"
+# Spaltendefinition für CREATE TABLE failed_scans (mit führendem Komma, leer ohne Unterstützung)
+_SQL_SUCCESS_RATE_COLUMN = (
+    f",\n                        success_rate REAL GENERATED ALWAYS AS ({_SUCCESS_RATE_EXPR}) VIRTUAL"
+    if _SQLITE_HAS_GENERATED_COLUMNS else ""
+)
+
+
+def _scan_column_sql(column: str) -> str:
+    """SELECT-Ausdruck für eine Spalte aus _SCAN_COLUMNS."""
+    if column == "success_rate" and not _SQLITE_HAS_GENERATED_COLUMNS:
+        return f"{_SQL_SUCCESS_RATE} AS success_rate"
+    return column
+
+
+_SQL_SCAN_COLUMNS = ", ".join(map(_scan_column_sql, _SCAN_COLUMNS))
+_SQL_APDU_COLUMNS = ", ".join(_APDU_COLUMNS)
+_ANALYSIS_COLUMNS = (
+    "id", "scan_id", "analysis_type", "analysis_result", "confidence_score",
+    "recommendation", "created_at",
+)
+
+# Spalten, die beim Archivieren kopiert werden (success_rate ist generiert)
+_ARCHIVE_COLUMNS = {
+    "failed_scans": ", ".join(c for c in _SCAN_COLUMNS if c != "success_rate"),
+    "apdu_responses": _SQL_APDU_COLUMNS,
+    "card_analysis": ", ".join(_ANALYSIS_COLUMNS),
+}
+
+# Hex-Spalten, die als rohe Bytes (BLOB) gespeichert und erst beim Lesen wieder als Hex formatiert werden
+_HEX_BLOB_COLUMNS = ("raw_atr_data", "uid_data", "command_apdu", "response_apdu")
+
+
+def _blob_to_hex(value: bytes) -> str:
+    """Formatiert Bytes wie smartcard.util.toHexString ("3B 8F 80 01")."""
+    return value.hex(' ').upper()
+
+
+def _hex_to_blob(value: Optional[str]) -> Any:
+    """
+    Wandelt einen Hex-String im toHexString-Format in Bytes um.
+    
+    Nur wenn _blob_to_hex den String exakt wiederherstellt; jede andere
+    Schreibweise (ohne Leerzeichen, Kleinbuchstaben, kein Hex) bleibt Text,
+    damit Lesezugriffe und Exporte dasselbe liefern wie gespeichert.
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        blob = bytes.fromhex(value)
+    except ValueError:
+        return value  # kein gültiges Hex - als Text behalten
+    return blob if _blob_to_hex(blob) == value else value
+
+
+def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    """Konvertiert eine DB-Zeile in ein Dict und formatiert BLOB-Spalten als Hex-String."""
+    data = dict(row)
+    for column in _HEX_BLOB_COLUMNS:
+        value = data.get(column)
+        if isinstance(value, bytes):
+            data[column] = _blob_to_hex(value)
+    return data
+
+
+_SQL_INSERT_ANALYSIS = """
+    INSERT INTO card_analysis 
+    (scan_id, analysis_type, analysis_result, confidence_score, recommendation)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
 class FailedNFCScanManager:
     """
     Verwaltet die Speicherung und Analyse von fehlgeschlagenen NFC-Scan-Rohdaten.
@@ -15,16 +146,84 @@ class FailedNFCScanManager:
     Funktionalität zu verbessern.
     """
     
+    # Prozessweiter Schreib-Lock: SQLite erlaubt nur einen Schreiber, daher
+    # serialisieren wir Schreibtransaktionen aller Instanzen schon in Python
+    # statt in busy_timeout/SQLITE_BUSY zu laufen. Lesen bleibt lock-frei (WAL).
+    # Reentrant, damit archive_older_than ATTACH/DETACH um eine Transaktion legen kann.
+    _write_lock = threading.RLock()
+    
     def __init__(self):
         """Initialisiere den FailedNFCScanManager und erstelle die Datenbank."""
         self.db_path = os.path.join(DATA_DIR, "failed_nfc_scans.db")
+        self.archive_path = os.path.join(DATA_DIR, "failed_nfc_scans_archive.db")
+        # Ein langlebiger Schreiber (serialisiert über _write_lock), Leser pro Thread
+        self._write_conn = self._connect(check_same_thread=False)
+        self._readers = threading.local()
+        self._maintenance_timer: Optional[threading.Timer] = None
+        self._maintenance_stopped = threading.Event()
         self._init_database()
+        self._schedule_maintenance()
+    
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """
+        Öffnet eine Verbindung mit den verbindungsbezogenen PRAGMAs.
+        
+        journal_mode=WAL ist persistent in der DB-Datei und wird nur in
+        _init_database gesetzt; busy_timeout & Co. gelten pro Verbindung.
+        """
+        # isolation_level=None: keine impliziten BEGINs des sqlite3-Moduls,
+        # Transaktionen werden explizit über _write_transaction gesteuert
+        conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread,
+                               cached_statements=256, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")   # WAL: fsync nur beim Checkpoint
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        conn.execute("PRAGMA cache_size=-20000")    # ~20 MB Page-Cache
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+    
+    def _reader(self) -> sqlite3.Connection:
+        """Gibt die Lese-Verbindung des aktuellen Threads zurück (WAL: parallel zum Schreiber)."""
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            # Eigene Verbindung statt cache=shared: Shared-Cache nutzt Tabellen-Locks
+            # und würde Leser wieder hinter den Schreiber stellen. Das Lesen über
+            # mmap (siehe _connect) spart die read()-Syscalls auch ohne geteilten Cache.
+            conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+            conn.row_factory = sqlite3.Row  # Für dict-ähnliche Zugriffe
+            self._readers.conn = conn
+        return conn
+    
+    @contextmanager
+    def _write_transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Schreibtransaktion auf der Schreiber-Verbindung.
+        
+        BEGIN IMMEDIATE holt die SQLite-Schreibsperre sofort statt erst beim
+        ersten INSERT (kein SHARED->RESERVED-Upgrade mit SQLITE_BUSY).
+        """
+        with self._write_lock:
+            conn = self._write_conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
     
     def _init_database(self) -> None:
         """Initialisiert die SQLite-Datenbank mit den benötigten Tabellen."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
+            # WAL: weniger fsyncs pro Commit, Leser blockieren den Schreiber nicht
+            # (journal_mode lässt sich nur außerhalb einer Transaktion ändern)
+            self._write_conn.execute("PRAGMA journal_mode=WAL")
+            # Seltener inline checkpointen - den Rest erledigt _run_maintenance im Hintergrund
+            self._write_conn.execute("PRAGMA wal_autocheckpoint=10000")
+            
+            with self._write_transaction() as conn:
+                conn.execute(f"""
                     CREATE TABLE IF NOT EXISTS failed_scans (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         timestamp TEXT NOT NULL,
@@ -33,21 +232,31 @@ class FailedNFCScanManager:
                         total_commands INTEGER DEFAULT 0,
                         successful_commands INTEGER DEFAULT 0,
                         error_summary TEXT,   -- JSON object with error counts
-                        raw_atr_data TEXT,    -- Raw ATR (Answer to Reset) data
-                        uid_data TEXT,        -- Card UID if available
+                        raw_atr_data BLOB,    -- Raw ATR (Answer to Reset) data
+                        uid_data BLOB,        -- Card UID if available
                         analysis_notes TEXT,  -- For manual notes
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP{_SQL_SUCCESS_RATE_COLUMN}
                     )
                 """)
                 
+                # Migration: ältere Datenbanken haben noch keine success_rate-Spalte
+                # (table_xinfo listet im Gegensatz zu table_info auch generierte Spalten)
+                if _SQLITE_HAS_GENERATED_COLUMNS:
+                    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(failed_scans)")}
+                    if "success_rate" not in columns:
+                        conn.execute(f"""
+                            ALTER TABLE failed_scans ADD COLUMN success_rate REAL GENERATED ALWAYS AS
+                                ({_SUCCESS_RATE_EXPR}) VIRTUAL
+                        """)
+                
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS apdu_responses (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         scan_id INTEGER NOT NULL,
                         command_sequence INTEGER NOT NULL,
                         command_name TEXT NOT NULL,
-                        command_apdu TEXT NOT NULL,   -- Hex string of APDU command
-                        response_apdu TEXT,           -- Hex string of APDU response
+                        command_apdu BLOB NOT NULL,   -- Raw APDU command bytes
+                        response_apdu BLOB,           -- Raw APDU response bytes
                         sw1 TEXT NOT NULL,            -- Status Word 1
                         sw2 TEXT NOT NULL,            -- Status Word 2
                         success BOOLEAN NOT NULL,
@@ -74,12 +283,18 @@ class FailedNFCScanManager:
                 # Indices für bessere Performance
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_failed_scans_timestamp ON failed_scans (timestamp)")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_failed_scans_card_type ON failed_scans (card_type)")
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_apdu_responses_scan_id ON apdu_responses (scan_id)")
+                if _SQLITE_HAS_GENERATED_COLUMNS:
+                    conn.execute("CREATE INDEX IF NOT EXISTS idx_failed_scans_rate ON failed_scans (success_rate)")
+                # (scan_id, command_sequence) liefert die APDUs eines Scans bereits sortiert
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_apdu_scan_seq ON apdu_responses (scan_id, command_sequence)")
+                conn.execute("DROP INDEX IF EXISTS idx_apdu_responses_scan_id")  # durch idx_apdu_scan_seq abgedeckt
+                # Partieller Index nur über Fehler-Responses für die Fehlercode-Statistik
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_apdu_err ON apdu_responses (success, sw1, sw2) WHERE success = 0")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_apdu_responses_success ON apdu_responses (success)")
-                
-                conn.commit()
-                log_system("Failed NFC Scans Datenbank erfolgreich initialisiert")
-                
+            
+            self._write_conn.execute("PRAGMA optimize")
+            log_system("Failed NFC Scans Datenbank erfolgreich initialisiert")
+            
         except Exception as e:
             log_error(f"Fehler beim Initialisieren der Failed NFC Scans Datenbank: {e}")
             raise
@@ -104,79 +319,71 @@ class FailedNFCScanManager:
             Die ID des gespeicherten Scans oder None bei Fehler
         """
         try:
-            # Extrahiere Metadaten aus den APDU-Responses
-            attempted_aids = []
+            # Extrahiere Metadaten aus den APDU-Responses (ein Durchlauf)
+            attempted_aids = set()  # Unique AIDs
             total_commands = len(apdu_responses)
             successful_commands = 0
-            error_counts = {}
+            error_counts = Counter()
             
             for response in apdu_responses:
-                # Sammle AIDs aus Select-Commands
-                command_name = response.get("command", "")
-                if "aid" in command_name.lower() or "select" in command_name.lower():
-                    apdu = response.get("apdu", "")
+                get = response.get
+                
+                # Sammle AIDs aus Select-Commands (nur der Präfix wird kleingeschrieben)
+                if get("command", "")[:6].lower().startswith(_AID_COMMAND_PREFIXES):
+                    apdu = get("apdu", "")
                     if apdu and len(apdu) > 10:  # Mindestlänge für AID-Selektion
-                        attempted_aids.append(apdu)
+                        attempted_aids.add(apdu)
                 
                 # Zähle erfolgreiche Commands
-                if response.get("success", False):
+                if get("success", False):
                     successful_commands += 1
                 
                 # Sammle Fehlercodes
-                sw1 = response.get("sw1", "")
-                sw2 = response.get("sw2", "")
+                sw1 = get("sw1", "")
+                sw2 = get("sw2", "")
                 if sw1 and sw2 and (sw1 != "90" or sw2 != "00"):
-                    error_code = f"{sw1}{sw2}"
-                    error_counts[error_code] = error_counts.get(error_code, 0) + 1
+                    error_counts[sw1 + sw2] += 1
             
             timestamp = datetime.now().isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            # Scan + APDUs in einer Transaktion
+            with self._write_transaction() as conn:
                 # Speichere Haupt-Scan-Record
-                cursor = conn.execute("""
-                    INSERT INTO failed_scans 
-                    (timestamp, card_type, attempted_aids, total_commands, 
-                     successful_commands, error_summary, raw_atr_data, uid_data, analysis_notes)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                cursor = conn.execute(_SQL_INSERT_SCAN, (
                     timestamp,
                     card_type,
-                    json.dumps(list(set(attempted_aids))),  # Unique AIDs
+                    _dumps_json(list(attempted_aids)),
                     total_commands,
                     successful_commands,
-                    json.dumps(error_counts),
-                    atr_data,
-                    uid_data,
+                    _dumps_json(error_counts),
+                    _hex_to_blob(atr_data),
+                    _hex_to_blob(uid_data),
                     analysis_notes
                 ))
                 
                 scan_id = cursor.lastrowid
                 
-                # Speichere einzelne APDU-Responses
-                for sequence, response in enumerate(apdu_responses):
-                    conn.execute("""
-                        INSERT INTO apdu_responses 
-                        (scan_id, command_sequence, command_name, command_apdu, 
-                         response_apdu, sw1, sw2, success, error_message, execution_time_ms)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
+                # Speichere einzelne APDU-Responses (Generator: keine Zwischenliste)
+                rows = (
+                    (
                         scan_id,
                         sequence,
                         response.get("command", "unknown"),
-                        response.get("apdu", ""),
-                        response.get("response", ""),
+                        _hex_to_blob(response.get("apdu", "")),
+                        _hex_to_blob(response.get("response", "")),
                         response.get("sw1", ""),
                         response.get("sw2", ""),
-                        response.get("success", False),
+                        bool(response.get("success", False)),
                         response.get("note", ""),
                         response.get("execution_time", None)
-                    ))
-                
-                conn.commit()
-                
-                log_system(f"Fehlgeschlagener NFC-Scan gespeichert: ID={scan_id}, Typ={card_type}, Commands={total_commands}, Erfolg={successful_commands}")
-                return scan_id
-                
+                    )
+                    for sequence, response in enumerate(apdu_responses)
+                )
+                conn.executemany(_SQL_INSERT_APDU, rows)
+            
+            log_system(f"Fehlgeschlagener NFC-Scan gespeichert: ID={scan_id}, Typ={card_type}, Commands={total_commands}, Erfolg={successful_commands}")
+            return scan_id
+            
         except Exception as e:
             log_error(f"Fehler beim Speichern des fehlgeschlagenen NFC-Scans: {e}")
             return None
@@ -201,19 +408,14 @@ class FailedNFCScanManager:
             True bei Erfolg, False bei Fehler
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT INTO card_analysis 
-                    (scan_id, analysis_type, analysis_result, confidence_score, recommendation)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
+            with self._write_transaction() as conn:
+                conn.execute(_SQL_INSERT_ANALYSIS, (
                     scan_id,
                     analysis_type,
-                    json.dumps(result),
+                    _dumps_json(result),
                     confidence,
                     recommendation
                 ))
-                conn.commit()
                 
             log_system(f"Analyseergebnis hinzugefügt: Scan ID={scan_id}, Typ={analysis_type}")
             return True
@@ -225,7 +427,8 @@ class FailedNFCScanManager:
     def get_failed_scans(self,
                         limit: int = 50,
                         card_type: Optional[str] = None,
-                        min_success_rate: Optional[float] = None) -> List[Dict[str, Any]]:
+                        min_success_rate: Optional[float] = None,
+                        columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         """
         Holt fehlgeschlagene Scans mit Filtermöglichkeiten.
         
@@ -233,50 +436,80 @@ class FailedNFCScanManager:
             limit: Maximale Anzahl der Ergebnisse
             card_type: Filter nach Kartentyp
             min_success_rate: Minimale Erfolgsrate (0.0 bis 1.0)
+            columns: Nur diese Spalten von failed_scans laden ('id' ist immer dabei);
+                     None lädt alle Spalten
             
         Returns:
             Liste der fehlgeschlagenen Scans
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row  # Für dict-ähnliche Zugriffe
-                
-                query = """
-                    SELECT * FROM failed_scans 
-                    WHERE 1=1
-                """
-                params = []
-                
-                if card_type:
-                    query += " AND card_type = ?"
-                    params.append(card_type)
-                
-                if min_success_rate is not None:
-                    query += " AND (CAST(successful_commands AS FLOAT) / total_commands) >= ?"
-                    params.append(min_success_rate)
-                
-                query += " ORDER BY created_at DESC LIMIT ?"
-                params.append(limit)
-                
-                cursor = conn.execute(query, params)
-                scans = [dict(row) for row in cursor.fetchall()]
-                
-                # Lade auch die APDU-Responses für jeden Scan
-                for scan in scans:
-                    scan_id = scan['id']
-                    cursor = conn.execute("""
-                        SELECT * FROM apdu_responses 
-                        WHERE scan_id = ? 
-                        ORDER BY command_sequence
-                    """, (scan_id,))
-                    scan['apdu_responses'] = [dict(row) for row in cursor.fetchall()]
-                
-                return scans
-                
+            if columns is None:
+                select_columns = _SQL_SCAN_COLUMNS
+            else:
+                unknown = set(columns) - set(_SCAN_COLUMNS)
+                if unknown:
+                    raise ValueError(f"Unbekannte Spalten: {', '.join(sorted(unknown))}")
+                select_columns = ", ".join(map(_scan_column_sql, ["id"] + [c for c in columns if c != "id"]))
+            
+            conn = self._reader()
+            query = f"""
+                SELECT {select_columns} FROM failed_scans 
+                WHERE 1=1
+            """
+            params = []
+            
+            if card_type:
+                query += " AND card_type = ?"
+                params.append(card_type)
+            
+            if min_success_rate is not None:
+                query += f" AND {_SQL_SUCCESS_RATE} >= ?"
+                params.append(min_success_rate)
+            
+            query += " ORDER BY created_at DESC LIMIT ?"
+            params.append(limit)
+            
+            cursor = conn.execute(query, params)
+            scans = [_row_to_dict(row) for row in cursor.fetchall()]
+            
+            # Lade die APDU-Responses aller Scans mit einer Abfrage statt einer pro Scan
+            responses_by_scan = defaultdict(list)
+            if scans:
+                scan_ids = [scan['id'] for scan in scans]
+                placeholders = ",".join("?" * len(scan_ids))
+                cursor = conn.execute(f"""
+                    SELECT {_SQL_APDU_COLUMNS} FROM apdu_responses 
+                    WHERE scan_id IN ({placeholders}) 
+                    ORDER BY scan_id, command_sequence
+                """, scan_ids)
+                for row in cursor:
+                    responses_by_scan[row['scan_id']].append(_row_to_dict(row))
+            
+            for scan in scans:
+                scan['apdu_responses'] = responses_by_scan.get(scan['id'], [])
+            
+            return scans
+        
         except Exception as e:
             log_error(f"Fehler beim Abrufen der fehlgeschlagenen Scans: {e}")
             return []
     
+    def _get_scan_by_id(self, scan_id: int) -> Optional[Dict[str, Any]]:
+        """Lädt einen einzelnen Scan samt APDU-Responses über den Primärschlüssel."""
+        conn = self._reader()
+        row = conn.execute(f"SELECT {_SQL_SCAN_COLUMNS} FROM failed_scans WHERE id = ?", (scan_id,)).fetchone()
+        if row is None:
+            return None
+        
+        scan = _row_to_dict(row)
+        cursor = conn.execute(f"""
+            SELECT {_SQL_APDU_COLUMNS} FROM apdu_responses 
+            WHERE scan_id = ? 
+            ORDER BY command_sequence
+        """, (scan_id,))
+        scan['apdu_responses'] = [_row_to_dict(r) for r in cursor.fetchall()]
+        return scan
+    
     def get_scan_statistics(self) -> Dict[str, Any]:
         """
         Gibt Statistiken über fehlgeschlagene Scans zurück.
@@ -285,48 +518,48 @@ class FailedNFCScanManager:
             Dictionary mit Statistiken
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                # Grundlegende Statistiken
-                cursor = conn.execute("""
-                    SELECT 
-                        COUNT(*) as total_failed_scans,
-                        AVG(CAST(successful_commands AS FLOAT) / total_commands) as avg_success_rate,
-                        COUNT(DISTINCT card_type) as unique_card_types,
-                        MIN(created_at) as first_scan,
-                        MAX(created_at) as last_scan
-                    FROM failed_scans
-                """)
-                basic_stats = dict(cursor.fetchone()) if cursor.fetchone() else {}
-                
-                # Kartentyp-Verteilung
-                cursor = conn.execute("""
-                    SELECT card_type, COUNT(*) as count 
-                    FROM failed_scans 
-                    GROUP BY card_type 
-                    ORDER BY count DESC
-                """)
-                card_type_distribution = [dict(row) for row in cursor.fetchall()]
-                
-                # Häufigste Fehlercodes
-                cursor = conn.execute("""
-                    SELECT sw1 || sw2 as error_code, COUNT(*) as count
-                    FROM apdu_responses 
-                    WHERE success = 0 AND sw1 != '' AND sw2 != ''
-                    GROUP BY error_code 
-                    ORDER BY count DESC 
-                    LIMIT 10
-                """)
-                common_errors = [dict(row) for row in cursor.fetchall()]
-                
-                return {
-                    "basic_statistics": basic_stats,
-                    "card_type_distribution": card_type_distribution,
-                    "common_error_codes": common_errors,
-                    "database_path": self.db_path
-                }
-                
+            conn = self._reader()
+            
+            # Grundlegende Statistiken
+            cursor = conn.execute(f"""
+                SELECT 
+                    COUNT(*) as total_failed_scans,
+                    AVG({_SQL_SUCCESS_RATE}) as avg_success_rate,
+                    COUNT(DISTINCT card_type) as unique_card_types,
+                    MIN(created_at) as first_scan,
+                    MAX(created_at) as last_scan
+                FROM failed_scans
+            """)
+            row = cursor.fetchone()
+            basic_stats = dict(row) if row else {}
+            
+            # Kartentyp-Verteilung
+            cursor = conn.execute("""
+                SELECT card_type, COUNT(*) as count 
+                FROM failed_scans 
+                GROUP BY card_type 
+                ORDER BY count DESC
+            """)
+            card_type_distribution = [dict(row) for row in cursor.fetchall()]
+            
+            # Häufigste Fehlercodes
+            cursor = conn.execute("""
+                SELECT sw1 || sw2 as error_code, COUNT(*) as count
+                FROM apdu_responses 
+                WHERE success = 0 AND sw1 != '' AND sw2 != ''
+                GROUP BY error_code 
+                ORDER BY count DESC 
+                LIMIT 10
+            """)
+            common_errors = [dict(row) for row in cursor.fetchall()]
+            
+            return {
+                "basic_statistics": basic_stats,
+                "card_type_distribution": card_type_distribution,
+                "common_error_codes": common_errors,
+                "database_path": self.db_path
+            }
+        
         except Exception as e:
             log_error(f"Fehler beim Abrufen der Scan-Statistiken: {e}")
             return {}
@@ -343,11 +576,7 @@ class FailedNFCScanManager:
             Exportierte Daten als String oder None bei Fehler
         """
         try:
-            scans = self.get_failed_scans(limit=1)
-            if not scans:
-                return None
-            
-            scan = next((s for s in scans if s['id'] == scan_id), None)
+            scan = self._get_scan_by_id(scan_id)
             if not scan:
                 return None
             
@@ -365,6 +594,113 @@ class FailedNFCScanManager:
         except Exception as e:
             log_error(f"Fehler beim Exportieren der Scan-Daten: {e}")
             return None
+    
+    def _schedule_maintenance(self) -> None:
+        """Plant den nächsten Wartungslauf als Daemon-Timer."""
+        if self._maintenance_stopped.is_set():
+            return
+        timer = threading.Timer(_MAINTENANCE_INTERVAL, self._run_maintenance)
+        timer.daemon = True
+        self._maintenance_timer = timer
+        timer.start()
+    
+    def _run_maintenance(self) -> None:
+        """
+        Periodische Wartung außerhalb des Schreibpfads.
+        
+        Archiviert alte Scans, leert die WAL-Datei per TRUNCATE-Checkpoint und
+        lässt SQLite die Statistiken für den Query-Planer aktualisieren, damit
+        kein save_failed_scan die Checkpoint-Kosten tragen muss.
+        """
+        try:
+            self.archive_older_than(_ARCHIVE_AFTER_DAYS)
+            with self._write_lock:
+                self._write_conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._write_conn.execute("PRAGMA optimize")
+        except Exception as e:
+            log_error(f"Fehler bei der Wartung der Failed NFC Scans Datenbank: {e}")
+        finally:
+            self._schedule_maintenance()
+    
+    def shutdown(self) -> None:
+        """Stoppt den Wartungs-Timer."""
+        self._maintenance_stopped.set()
+        timer, self._maintenance_timer = self._maintenance_timer, None
+        if timer is not None:
+            timer.cancel()
+    
+    def archive_older_than(self, days: int = 90) -> int:
+        """
+        Verschiebt Scans, die älter als `days` Tage sind, in die Archiv-Datenbank.
+        
+        Hält failed_scans/apdu_responses klein, sodass Abfragen und Statistiken
+        nicht mit der Gesamthistorie wachsen. Die Archiv-Tabellen werden beim
+        ersten Aufruf mit den Spalten der Live-Tabellen angelegt.
+        
+        Args:
+            days: Scans mit created_at älter als diese Anzahl Tage werden archiviert
+            
+        Returns:
+            Anzahl der archivierten Scans
+        """
+        cutoff = (f"-{int(days)} days",)
+        old_scans = "SELECT id FROM main.failed_scans WHERE created_at < datetime('now', ?)"
+        
+        try:
+            with self._write_lock:
+                conn = self._write_conn
+                # ATTACH/DETACH sind innerhalb einer Transaktion nicht erlaubt
+                conn.execute("ATTACH DATABASE ? AS arc", (self.archive_path,))
+                try:
+                    with self._write_transaction():
+                        for table, columns in _ARCHIVE_COLUMNS.items():
+                            conn.execute(f"CREATE TABLE IF NOT EXISTS arc.{table} AS "
+                                         f"SELECT {columns} FROM main.{table} WHERE 0")
+                        
+                        archived = conn.execute(f"""
+                            INSERT INTO arc.failed_scans ({_ARCHIVE_COLUMNS['failed_scans']})
+                            SELECT {_ARCHIVE_COLUMNS['failed_scans']} FROM main.failed_scans
+                            WHERE created_at < datetime('now', ?)
+                        """, cutoff).rowcount
+                        
+                        if archived:
+                            for table in ("apdu_responses", "card_analysis"):
+                                columns = _ARCHIVE_COLUMNS[table]
+                                conn.execute(f"""
+                                    INSERT INTO arc.{table} ({columns})
+                                    SELECT {columns} FROM main.{table} WHERE scan_id IN ({old_scans})
+                                """, cutoff)
+                                conn.execute(f"DELETE FROM main.{table} WHERE scan_id IN ({old_scans})", cutoff)
+                            conn.execute("DELETE FROM main.failed_scans WHERE created_at < datetime('now', ?)", cutoff)
+                finally:
+                    conn.execute("DETACH DATABASE arc")
+            
+            if archived:
+                log_system(f"Fehlgeschlagene NFC-Scans archiviert: {archived} Scans älter als {days} Tage")
+            return archived
+            
+        except Exception as e:
+            log_error(f"Fehler beim Archivieren alter NFC-Scans: {e}")
+            return 0
+
+# Globale Instanz - wird erst beim ersten Zugriff erzeugt, damit ein Import
+# nicht schon die Datenbank öffnet und das Schema anlegt
+_failed_scan_manager: Optional[FailedNFCScanManager] = None
+_failed_scan_manager_lock = threading.Lock()
+
+
+def get_failed_scan_manager() -> FailedNFCScanManager:
+    """Gibt die prozessweite FailedNFCScanManager-Instanz zurück (lazy erzeugt)."""
+    global _failed_scan_manager
+    if _failed_scan_manager is None:
+        with _failed_scan_manager_lock:
+            if _failed_scan_manager is None:
+                _failed_scan_manager = FailedNFCScanManager()
+    return _failed_scan_manager
+
 
-# Globale Instanz
-failed_scan_manager = FailedNFCScanManager() 
\ No newline at end of file
+def __getattr__(name: str):
+    # Rückwärtskompatibilität: `from ... import failed_scan_manager`
+    if name == "failed_scan_manager":
+        return get_failed_scan_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -15,19 +15,120 @@ Features:
 
 import sqlite3
 import os
+import io
 import json
 import logging
+import threading
+from contextlib import closing, contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Iterator
 from dataclasses import dataclass
+from types import MappingProxyType
 import hashlib
 import re
+import secrets
+import sys
 from ..config import DATA_DIR
 from ..logger import log_system, log_error
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# SQL als Modulkonstanten: identischer Text trifft den Statement-Cache der Verbindung
+_SQL_SELECT_CARD_BY_HASH = """
+    SELECT id, scan_count FROM nfc_card_identifiers 
+    WHERE card_hash = ?
+"""
+
+_SQL_UPSERT_CARD = """
+    INSERT INTO nfc_card_identifiers 
+    (card_hash, card_type, partial_pan, uid_data, bank_identifier, 
+     confidence_score, raw_data_size, scan_timestamp, last_seen)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(card_hash) DO UPDATE
+    SET scan_count = scan_count + 1, last_seen = excluded.last_seen,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+# RETURNING gibt es erst ab SQLite 3.35; ältere Versionen lesen id/scan_count nach
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_SQL_UPSERT_CARD_RETURNING = _SQL_UPSERT_CARD + "    RETURNING id, scan_count\n"
+
+_SQL_INSERT_APDU = """
+    INSERT INTO nfc_apdu_commands
+    (card_id, scan_session_id, command_sequence, command_name,
+     apdu_hex, response_hex, status_word, success, execution_time_ms, error_message)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_EXTRACT = """
+    INSERT INTO nfc_raw_extracts
+    (card_id, extract_type, raw_hex_data, extraction_method, quality_score)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_UPDATE_STATUS = """
+    UPDATE nfc_card_identifiers 
+    SET status = ?, admin_notes = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+# Bekannte Bank-BINs für bessere Kartentyp-Erkennung (als Paare, damit doppelte
+# BINs beim Import auffallen statt sich still zu überschreiben)
+_BANK_BIN_ENTRIES = (
+    # Deutsche Sparkassen
+    ("403570", "Sparkasse Dortmund"),
+    ("520420", "Sparkasse Köln/Bonn"),
+    ("543330", "Sparkasse Münsterland Ost"),
+    ("545230", "Kreissparkasse Düsseldorf"),
+    ("547620", "Sparkasse Vest"),
+    
+    # Volksbanken/Raiffeisenbanken
+    ("471635", "Volksbank eG"),
+    ("472135", "Raiffeisenbank eG"),
+    ("402135", "Volksbank Raiffeisenbank eG"),
+    
+    # Großbanken
+    ("444999", "Deutsche Bank AG"),
+    ("454617", "Commerzbank"),
+    ("520030", "Postbank"),
+)
+_BANK_BINS = MappingProxyType(dict(_BANK_BIN_ENTRIES))
+assert len(_BANK_BINS) == len(_BANK_BIN_ENTRIES), "Doppelte BIN in _BANK_BIN_ENTRIES"
+
+# Fallback: Bank-Identifikator aus dem Kartentyp
+_CARD_TYPE_BANKS = (
+    ('sparkasse', 'Sparkassen-Finanzgruppe'),
+    ('volksbank', 'Volksbanken Raiffeisenbanken'),
+    ('deutsche_bank', 'Deutsche Bank AG'),
+    ('commerzbank', 'Commerzbank AG'),
+    ('postbank', 'Deutsche Postbank AG'),
+)
+
+# PAN-Patterns, beginnend mit 4-6 (Visa, Mastercard, Maestro): zuerst die
+# 16-stellige Kreditkarten-PAN, sonst variable Länge (13-19 Ziffern)
+_PAN16_RE = re.compile(r'[4-6]\d{15}')
+_PAN_RE = re.compile(r'[4-6]\d{12,18}')
+
+
+def _as_hex(data: Any) -> Any:
+    """
+    Hex-Text eines APDU-Felds. Rohdaten (bytes oder pyscard-Bytelisten) werden
+    einmalig im Format von smartcard.util.toHexString ("6F 1A ...") kodiert,
+    damit Hash und gespeicherte Daten unabhängig von der Darstellung gleich bleiben.
+    """
+    if data is None or isinstance(data, str):
+        return data
+    return bytes(data).hex(' ').upper()
+
+
+# slots=True braucht Python 3.10; ältere Interpreter (Bullseye) behalten __dict__-Instanzen
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Datenbankpfade, deren Schema in diesem Prozess bereits angelegt wurde
+_SCHEMA_READY = set()
+_SCHEMA_READY_LOCK = threading.Lock()
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class NFCCardIdentifier:
     """Strukturierte Repräsentation einer NFC-Karten-Identifikation."""
     card_hash: str          # SHA-256 Hash der Karte (für Privatsphäre)
@@ -40,7 +141,7 @@ class NFCCardIdentifier:
     scan_timestamp: str    # Zeitstempel des ersten Scans
     scan_count: int        # Anzahl der Scans dieser Karte
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class APDUCommand:
     """Strukturierte APDU-Kommando-Daten."""
     command_name: str
@@ -58,36 +159,77 @@ class NFCRawDataAnalyzer:
     
     def __init__(self):
         self.db_path = os.path.join(DATA_DIR, "nfc_raw_data_analysis.db")
-        self._init_database()
+        os.makedirs(DATA_DIR, exist_ok=True)
+        # Ein langlebiger Schreiber (serialisiert über _write_lock), Leser pro Thread
+        self._write_lock = threading.Lock()
+        self._write_conn = self._connect(check_same_thread=False)
+        self._readers = threading.local()
+        with _SCHEMA_READY_LOCK:
+            if self.db_path not in _SCHEMA_READY:
+                self._init_database()
+                _SCHEMA_READY.add(self.db_path)
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """
+        Öffnet eine Verbindung mit den verbindungsbezogenen PRAGMAs.
         
-        # Bekannte Bank-BINs für bessere Kartentyp-Erkennung
-        self.bank_bins = {
-            # Deutsche Sparkassen
-            "403570": "Sparkasse Dortmund",
-            "520420": "Sparkasse Köln/Bonn", 
-            "543330": "Sparkasse Münsterland Ost",
-            "545230": "Kreissparkasse Düsseldorf",
-            "547620": "Sparkasse Vest",
-            "403570": "Sparkasse Dortmund",
-            
-            # Volksbanken/Raiffeisenbanken
-            "471635": "Volksbank eG",
-            "472135": "Raiffeisenbank eG",
-            "402135": "Volksbank Raiffeisenbank eG",
-            
-            # Großbanken
-            "444999": "Deutsche Bank",
-            "454617": "Commerzbank", 
-            "520030": "Postbank",
-            "444999": "Deutsche Bank AG",
-        }
+        journal_mode=WAL ist persistent in der DB-Datei und wird nur in
+        _init_database gesetzt; synchronous & Co. gelten pro Verbindung.
+        """
+        # isolation_level=None: keine impliziten BEGINs des sqlite3-Moduls,
+        # Transaktionen werden explizit über _write_transaction gesteuert
+        conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread,
+                               cached_statements=256, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")   # WAL: fsync nur beim Checkpoint
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+            conn.execute("PRAGMA cache_size=-20000")    # ~20 MB Page-Cache
+            conn.execute("PRAGMA foreign_keys=ON")
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite-PRAGMAs konnten nicht gesetzt werden: {e}")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Gibt die Lese-Verbindung des aktuellen Threads zurück (WAL: parallel zum Schreiber)."""
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row  # dict(row) statt zip über cursor.description
+            self._readers.conn = conn
+        return conn
+
+    @contextmanager
+    def _write_transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Schreibtransaktion auf der Schreiber-Verbindung (Commit bzw. Rollback beim Verlassen).
+        
+        BEGIN IMMEDIATE holt die SQLite-Schreibsperre sofort statt erst beim
+        ersten INSERT (kein SHARED->RESERVED-Upgrade mit SQLITE_BUSY).
+        Cursor noch innerhalb schließen: sonst setzt ihr Finalizer außerhalb des
+        Locks das gecachte Statement zurück, das ein anderer Thread gerade nutzt.
+        """
+        with self._write_lock:
+            conn = self._write_conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
 
     def _init_database(self) -> None:
         """Initialisiert die erweiterte SQLite-Datenbank."""
         try:
-            os.makedirs(DATA_DIR, exist_ok=True)
+            try:
+                # WAL statt Rollback-Journal: ein fsync pro Checkpoint statt pro Commit,
+                # Leser blockieren den Schreiber nicht mehr (nur außerhalb einer Transaktion)
+                self._write_conn.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.Error as e:
+                logger.warning(f"WAL-Modus konnte nicht aktiviert werden: {e}")
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_transaction() as conn:
                 # Haupttabelle für NFC-Karten-Identifikatoren
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS nfc_card_identifiers (
@@ -146,8 +288,24 @@ class NFCRawDataAnalyzer:
                 # Index für bessere Performance
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_card_hash ON nfc_card_identifiers(card_hash)")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_card_type ON nfc_card_identifiers(card_type)")
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_status ON nfc_card_identifiers(status)")
+                # Liefert die Sortierung von get_unknown_cards (ersetzt idx_status als Präfix)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_status_scan_last
+                    ON nfc_card_identifiers(status, scan_count DESC, last_seen DESC)
+                """)
+                conn.execute("DROP INDEX IF EXISTS idx_status")
+                # Ausdrucksindex für die Status-Rangfolge in get_all_cards (Ausdruck muss
+                # exakt dem ORDER BY entsprechen)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_status_rank_scan_last
+                    ON nfc_card_identifiers(
+                        (CASE status WHEN 'unknown' THEN 0 WHEN 'approved' THEN 1
+                                     WHEN 'rejected' THEN 2 ELSE 3 END),
+                        scan_count DESC, last_seen DESC)
+                """)
                 
+            # Statistiken für den Query-Planer aktualisieren, falls nötig
+            self._write_conn.execute("PRAGMA optimize")
             log_system("NFC Raw Data Analyzer Datenbank erfolgreich initialisiert")
             
         except Exception as e:
@@ -166,8 +324,9 @@ class NFCRawDataAnalyzer:
         Args:
             card_type: Erkannter Kartentyp
             apdu_responses: Liste der APDU-Kommandos und Responses
-            atr_data: ATR-Daten als Hex-String
-            uid_data: Karten-UID falls verfügbar
+                (apdu/response als Hex-String oder Rohdaten)
+            atr_data: ATR-Daten als Hex-String oder Rohdaten
+            uid_data: Karten-UID falls verfügbar (Hex-String oder Rohdaten)
             analysis_notes: Zusätzliche Analyse-Notizen
             
         Returns:
@@ -175,97 +334,75 @@ class NFCRawDataAnalyzer:
         """
         try:
             # Generiere eine eindeutige Session-ID
-            session_id = f"nfc_scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hashlib.md5(str(apdu_responses).encode()).hexdigest()[:8]}"
+            # Ein Zeitstempel für Session-ID, scan_timestamp und last_seen
+            now = datetime.now()
+            now_iso = now.isoformat()
+            session_id = f"nfc_scan_{now:%Y%m%d_%H%M%S}_{secrets.token_hex(4)}"
+            
+            # Rohdaten einmalig in Hex-Text umwandeln (Hex-Strings bleiben unverändert)
+            atr_data = _as_hex(atr_data)
+            uid_data = _as_hex(uid_data)
             
             # Extrahiere Karten-Identifikator
-            card_identifier = self._extract_card_identifier(card_type, apdu_responses, atr_data, uid_data)
+            card_identifier = self._extract_card_identifier(card_type, apdu_responses, atr_data, uid_data,
+                                                            scan_timestamp=now_iso)
             
             if not card_identifier:
                 log_error(f"Konnte keinen Karten-Identifikator aus Scan extrahieren: {session_id}")
                 return None
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Prüfe, ob diese Karte bereits bekannt ist
-                cursor.execute("""
-                    SELECT id, scan_count FROM nfc_card_identifiers 
-                    WHERE card_hash = ?
-                """, (card_identifier.card_hash,))
-                
-                existing_card = cursor.fetchone()
+            with self._write_transaction() as conn, closing(conn.cursor()) as cursor:
+                
+                # Neue Karte anlegen oder Scan-Zähler der bekannten Karte erhöhen -
+                # ein Statement statt SELECT + INSERT/UPDATE, ohne Race zwischen beiden
+                card_params = (
+                    card_identifier.card_hash,
+                    card_identifier.card_type,
+                    card_identifier.partial_pan,
+                    card_identifier.uid_data,
+                    card_identifier.bank_identifier,
+                    card_identifier.confidence_score,
+                    card_identifier.raw_data_size,
+                    card_identifier.scan_timestamp,
+                    now_iso
+                )
+                if _SQLITE_HAS_RETURNING:
+                    cursor.execute(_SQL_UPSERT_CARD_RETURNING, card_params)
+                else:
+                    cursor.execute(_SQL_UPSERT_CARD, card_params)
+                    cursor.execute(_SQL_SELECT_CARD_BY_HASH, (card_identifier.card_hash,))
+                card_id, scan_count = cursor.fetchone()
                 
-                if existing_card:
-                    # Update existierende Karte
-                    card_id, current_scan_count = existing_card
-                    new_scan_count = current_scan_count + 1
-                    
-                    cursor.execute("""
-                        UPDATE nfc_card_identifiers 
-                        SET scan_count = ?, last_seen = ?, updated_at = CURRENT_TIMESTAMP
-                        WHERE id = ?
-                    """, (new_scan_count, datetime.now().isoformat(), card_id))
-                    
-                    log_system(f"Bekannte NFC-Karte aktualisiert: {card_identifier.card_hash[:12]}... (Scan #{new_scan_count})")
-                    
+                if scan_count > 1:
+                    log_system(f"Bekannte NFC-Karte aktualisiert: {card_identifier.card_hash[:12]}... (Scan #{scan_count})")
                 else:
-                    # Neue Karte hinzufügen
-                    cursor.execute("""
-                        INSERT INTO nfc_card_identifiers 
-                        (card_hash, card_type, partial_pan, uid_data, bank_identifier, 
-                         confidence_score, raw_data_size, scan_timestamp, last_seen)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        card_identifier.card_hash,
-                        card_identifier.card_type,
-                        card_identifier.partial_pan,
-                        card_identifier.uid_data,
-                        card_identifier.bank_identifier,
-                        card_identifier.confidence_score,
-                        card_identifier.raw_data_size,
-                        card_identifier.scan_timestamp,
-                        datetime.now().isoformat()
-                    ))
-                    
-                    card_id = cursor.lastrowid
                     log_system(f"Neue NFC-Karte registriert: {card_identifier.card_hash[:12]}... (ID: {card_id})")
                 
-                # Speichere APDU-Kommandos
-                for i, response in enumerate(apdu_responses):
-                    cursor.execute("""
-                        INSERT INTO nfc_apdu_commands
-                        (card_id, scan_session_id, command_sequence, command_name,
-                         apdu_hex, response_hex, status_word, success, execution_time_ms, error_message)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
+                # Speichere APDU-Kommandos (ein executemany statt eines INSERTs pro Kommando)
+                cursor.executemany(_SQL_INSERT_APDU, [
+                    (
                         card_id,
                         session_id,
                         i + 1,
                         response.get('command', 'unknown'),
-                        response.get('apdu', ''),
-                        response.get('response', ''),
-                        f"{response.get('sw1', '')}{ response.get('sw2', '')}",
+                        _as_hex(response.get('apdu', '')),
+                        _as_hex(response.get('response', '')),
+                        f"{response.get('sw1', '')}{response.get('sw2', '')}",
                         response.get('success', False),
                         response.get('execution_time_ms'),
                         response.get('error_message')
-                    ))
+                    )
+                    for i, response in enumerate(apdu_responses)
+                ])
                 
                 # Speichere Rohdaten-Extrakte
-                if atr_data:
-                    cursor.execute("""
-                        INSERT INTO nfc_raw_extracts
-                        (card_id, extract_type, raw_hex_data, extraction_method, quality_score)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (card_id, 'atr', atr_data, 'direct_extraction', 1.0))
-                
-                if uid_data:
-                    cursor.execute("""
-                        INSERT INTO nfc_raw_extracts
-                        (card_id, extract_type, raw_hex_data, extraction_method, quality_score)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (card_id, 'uid', uid_data, 'direct_extraction', 1.0))
-                
-                conn.commit()
+                raw_extracts = [
+                    (card_id, extract_type, raw_hex, 'direct_extraction', 1.0)
+                    for extract_type, raw_hex in (('atr', atr_data), ('uid', uid_data))
+                    if raw_hex
+                ]
+                if raw_extracts:
+                    cursor.executemany(_SQL_INSERT_EXTRACT, raw_extracts)
                 
             log_system(f"NFC-Scan erfolgreich analysiert und gespeichert: {session_id}")
             return session_id
@@ -278,33 +415,49 @@ class NFCRawDataAnalyzer:
                                  card_type: str,
                                  apdu_responses: List[Dict],
                                  atr_data: Optional[str],
-                                 uid_data: Optional[str]) -> Optional[NFCCardIdentifier]:
+                                 uid_data: Optional[str],
+                                 scan_timestamp: Optional[str] = None) -> Optional[NFCCardIdentifier]:
         """
         Extrahiert einen eindeutigen aber privacy-sicheren Karten-Identifikator.
+        
+        scan_timestamp übernimmt den Zeitstempel des Aufrufers (sonst jetzt).
         """
         try:
-            # Sammle alle verfügbaren Daten für Hash-Generierung
+            # Sammle alle verfügbaren Daten für Hash-Generierung als (Präfix, Bytes)-Paare;
+            # die Präfixe unterscheiden sich im ersten Byte, daher sortieren die Paare
+            # genau wie die früheren zusammengesetzten Strings "atr:...", "resp:..."
             hash_components = []
             
             if atr_data:
-                hash_components.append(f"atr:{atr_data}")
+                hash_components.append((b"atr:", atr_data.encode()))
             
             if uid_data:
-                hash_components.append(f"uid:{uid_data}")
+                hash_components.append((b"uid:", uid_data.encode()))
             
             # Sammle Response-Daten aus APDU-Kommandos
             successful_responses = []
             for response in apdu_responses:
-                if response.get('success') and response.get('response'):
-                    successful_responses.append(response.get('response', ''))
-                    hash_components.append(f"resp:{response.get('response', '')}")
+                response_data = response.get('response')
+                if response.get('success') and response_data:
+                    response_hex = _as_hex(response_data)
+                    successful_responses.append(response_hex)
+                    hash_components.append((b"resp:", response_hex.encode()))
             
             if not hash_components:
                 return None
             
-            # Generiere Privacy-sicheren Hash
-            hash_data = "|".join(sorted(hash_components))
-            card_hash = hashlib.sha256(hash_data.encode()).hexdigest()
+            # Generiere Privacy-sicheren Hash: sortierte Komponenten, getrennt durch "|",
+            # Stück für Stück in den Digest statt über einen zusammengefügten String.
+            # UTF-8 erhält die Sortierreihenfolge, der Hash bleibt daher unverändert.
+            hash_components.sort()
+            digest = hashlib.sha256()
+            separator = b""
+            for prefix, payload in hash_components:
+                digest.update(separator)
+                digest.update(prefix)
+                digest.update(payload)
+                separator = b"|"
+            card_hash = digest.hexdigest()
             
             # Versuche PAN-Extraktion für Teilanzeige
             partial_pan = self._extract_partial_pan(successful_responses)
@@ -316,7 +469,8 @@ class NFCRawDataAnalyzer:
             confidence_score = self._calculate_confidence_score(apdu_responses, atr_data, uid_data)
             
             # Berechne Rohdaten-Größe
-            raw_data_size = len(hash_data.encode())
+            raw_data_size = sum(len(prefix) + len(payload) + 1
+                                for prefix, payload in hash_components) - 1
             
             return NFCCardIdentifier(
                 card_hash=card_hash,
@@ -326,7 +480,7 @@ class NFCRawDataAnalyzer:
                 bank_identifier=bank_identifier,
                 confidence_score=confidence_score,
                 raw_data_size=raw_data_size,
-                scan_timestamp=datetime.now().isoformat(),
+                scan_timestamp=scan_timestamp or datetime.now().isoformat(),
                 scan_count=1
             )
             
@@ -339,20 +493,22 @@ class NFCRawDataAnalyzer:
         Extrahiert eine Teilweise PAN (erste 6 + letzte 4 Ziffern) für Anzeigezwecke.
         """
         try:
-            for response in response_data:
-                # Suche nach PAN-ähnlichen Patterns in den Responses
-                pan_patterns = [
-                    r'([4-6]\d{15})',  # 16-stellige Kreditkarten-PAN
-                    r'([4-6]\d{12,18})',  # Variable Länge
-                ]
+            # Ein Suchlauf je Pattern über alle Responses; "|" trennt sie, damit
+            # keine Ziffernfolge über eine Response-Grenze hinweg gefunden wird
+            combined = "|".join(response_data).replace(' ', '')
+            
+            # Der erste Treffer variabler Länge liegt in der ersten Response mit
+            # einer PAN-ähnlichen Ziffernfolge; hat dieselbe Response auch eine
+            # 16-stellige PAN, hat diese Vorrang (wie zuvor je Response)
+            match = _PAN_RE.search(combined)
+            if match:
+                match16 = _PAN16_RE.search(combined, match.start())
+                if match16 and "|" not in combined[match.start():match16.start()]:
+                    match = match16
+                pan = match.group()
+                # Rückgabe: erste 6 + letzte 4 Ziffern
+                return f"{pan[:6]}...{pan[-4:]}"
                 
-                for pattern in pan_patterns:
-                    matches = re.findall(pattern, response.replace(' ', ''))
-                    for match in matches:
-                        if len(match) >= 13 and match.isdigit():
-                            # Rückgabe: erste 6 + letzte 4 Ziffern
-                            return f"{match[:6]}...{match[-4:]}"
-                            
         except Exception as e:
             logger.debug(f"PAN-Extraktion fehlgeschlagen: {e}")
         
@@ -364,21 +520,14 @@ class NFCRawDataAnalyzer:
         """
         try:
             if partial_pan and len(partial_pan) >= 6:
-                bin_code = partial_pan[:6]
-                if bin_code in self.bank_bins:
-                    return self.bank_bins[bin_code]
+                bank = _BANK_BINS.get(partial_pan[:6])
+                if bank:
+                    return bank
             
             # Fallback basierend auf Kartentyp
-            type_mapping = {
-                'sparkasse': 'Sparkassen-Finanzgruppe',
-                'volksbank': 'Volksbanken Raiffeisenbanken',
-                'deutsche_bank': 'Deutsche Bank AG',
-                'commerzbank': 'Commerzbank AG',
-                'postbank': 'Deutsche Postbank AG'
-            }
-            
-            for key, value in type_mapping.items():
-                if key in card_type.lower():
+            card_type_lower = card_type.lower()
+            for key, value in _CARD_TYPE_BANKS:
+                if key in card_type_lower:
                     return value
                     
         except Exception as e:
@@ -422,14 +571,15 @@ class NFCRawDataAnalyzer:
         except Exception:
             return 0.0
 
-    def get_unknown_cards(self, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_unknown_cards(self, limit: int = 50) -> Iterator[Dict[str, Any]]:
         """
-        Holt alle unbekannten Karten zur Admin-Bewertung.
+        Liefert die unbekannten Karten zur Admin-Bewertung zeilenweise.
+        
+        Generator: die Abfrage läuft erst beim Iterieren; wer eine Liste
+        braucht, nimmt list(...).
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
+            with closing(self._reader().cursor()) as cursor:
                 cursor.execute("""
                     SELECT id, card_hash, card_type, partial_pan, bank_identifier,
                            confidence_score, scan_count, scan_timestamp, last_seen,
@@ -440,27 +590,20 @@ class NFCRawDataAnalyzer:
                     LIMIT ?
                 """, (limit,))
                 
-                columns = [desc[0] for desc in cursor.description]
-                results = []
-                
-                for row in cursor.fetchall():
-                    card_data = dict(zip(columns, row))
-                    results.append(card_data)
-                
-                return results
-                
+                for row in cursor:
+                    yield dict(row)
+            
         except Exception as e:
             log_error(f"Fehler beim Laden unbekannter Karten: {e}")
-            return []
 
-    def get_all_cards(self, limit: int = 100) -> List[Dict[str, Any]]:
+    def get_all_cards(self, limit: int = 100) -> Iterator[Dict[str, Any]]:
         """
-        Holt alle Karten (alle Status) für das vereinheitlichte Fallback-Log.
+        Liefert alle Karten (alle Status) für das vereinheitlichte Fallback-Log zeilenweise.
+        
+        Generator wie get_unknown_cards.
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
+            with closing(self._reader().cursor()) as cursor:
                 cursor.execute("""
                     SELECT id, card_hash, card_type, partial_pan, bank_identifier,
                            confidence_score, scan_count, scan_timestamp, last_seen,
@@ -478,32 +621,20 @@ class NFCRawDataAnalyzer:
                     LIMIT ?
                 """, (limit,))
                 
-                columns = [desc[0] for desc in cursor.description]
-                results = []
-                
-                for row in cursor.fetchall():
-                    card_data = dict(zip(columns, row))
-                    results.append(card_data)
-                
-                return results
-                
+                for row in cursor:
+                    yield dict(row)
+            
         except Exception as e:
             log_error(f"Fehler beim Laden aller Karten: {e}")
-            return []
 
     def update_card_status(self, card_id: int, status: str, admin_notes: Optional[str] = None) -> bool:
         """
         Aktualisiert den Status einer Karte (approved/rejected/unknown).
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._write_transaction() as conn, closing(conn.cursor()) as cursor:
                 
-                cursor.execute("""
-                    UPDATE nfc_card_identifiers 
-                    SET status = ?, admin_notes = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, admin_notes, card_id))
+                cursor.execute(_SQL_UPDATE_STATUS, (status, admin_notes, card_id))
                 
                 if cursor.rowcount > 0:
                     log_system(f"Kartenstatus aktualisiert: ID={card_id}, Status={status}")
@@ -521,106 +652,122 @@ class NFCRawDataAnalyzer:
         Holt detaillierte Informationen zu einer Karte inklusive APDU-Kommandos.
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Hole Karten-Grunddaten
-                cursor.execute("""
-                    SELECT * FROM nfc_card_identifiers WHERE id = ?
-                """, (card_id,))
-                
-                card_row = cursor.fetchone()
-                if not card_row:
-                    return None
-                
-                columns = [desc[0] for desc in cursor.description]
-                card_data = dict(zip(columns, card_row))
-                
-                # Hole APDU-Kommandos
-                cursor.execute("""
-                    SELECT command_name, apdu_hex, response_hex, status_word, success,
-                           execution_time_ms, error_message
-                    FROM nfc_apdu_commands 
-                    WHERE card_id = ?
-                    ORDER BY command_sequence
-                """, (card_id,))
-                
-                apdu_columns = [desc[0] for desc in cursor.description]
-                apdu_commands = []
-                
-                for row in cursor.fetchall():
-                    apdu_data = dict(zip(apdu_columns, row))
-                    apdu_commands.append(apdu_data)
-                
-                card_data['apdu_commands'] = apdu_commands
-                
-                # Hole Rohdaten-Extrakte
-                cursor.execute("""
-                    SELECT extract_type, raw_hex_data, decoded_data, extraction_method, quality_score
-                    FROM nfc_raw_extracts 
-                    WHERE card_id = ?
-                    ORDER BY created_at
-                """, (card_id,))
-                
-                extract_columns = [desc[0] for desc in cursor.description]
-                raw_extracts = []
-                
-                for row in cursor.fetchall():
-                    extract_data = dict(zip(extract_columns, row))
-                    raw_extracts.append(extract_data)
-                
-                card_data['raw_extracts'] = raw_extracts
-                
-                return card_data
-                
+            conn = self._reader()
+            cursor = conn.cursor()
+            
+            # Karte, APDU-Kommandos und Rohdaten-Extrakte in einer Abfrage;
+            # die Kind-Tabellen kommen als JSON-Arrays zurück
+            cursor.execute("""
+                SELECT c.*,
+                       (SELECT json_group_array(json_object(
+                                   'command_name', command_name, 'apdu_hex', apdu_hex,
+                                   'response_hex', response_hex, 'status_word', status_word,
+                                   'success', success, 'execution_time_ms', execution_time_ms,
+                                   'error_message', error_message))
+                        FROM (SELECT * FROM nfc_apdu_commands
+                              WHERE card_id = c.id
+                              ORDER BY command_sequence)) AS apdu_commands_json,
+                       (SELECT json_group_array(json_object(
+                                   'extract_type', extract_type, 'raw_hex_data', raw_hex_data,
+                                   'decoded_data', decoded_data, 'extraction_method', extraction_method,
+                                   'quality_score', quality_score))
+                        FROM (SELECT * FROM nfc_raw_extracts
+                              WHERE card_id = c.id
+                              ORDER BY created_at, id)) AS raw_extracts_json
+                FROM nfc_card_identifiers c
+                WHERE c.id = ?
+            """, (card_id,))
+            
+            card_row = cursor.fetchone()
+            if not card_row:
+                return None
+            
+            card_data = dict(card_row)
+            card_data['apdu_commands'] = json.loads(card_data.pop('apdu_commands_json'))
+            card_data['raw_extracts'] = json.loads(card_data.pop('raw_extracts_json'))
+            
+            return card_data
+            
         except Exception as e:
             log_error(f"Fehler beim Laden der Kartendetails: {e}")
             return None
 
-    def export_card_data(self, status_filter: Optional[str] = None) -> str:
+    def export_card_data(self, status_filter: Optional[str] = None, pretty: bool = True) -> str:
         """
         Exportiert Kartendaten als JSON für weitere Analyse.
+        
+        Die Karten werden zeilenweise in einen Puffer geschrieben statt erst als
+        Liste gesammelt; das Ergebnis entspricht json.dumps des Export-Dicts
+        (pretty=True: mit indent=2, wie der Download bisher).
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                query = """
-                    SELECT id, card_hash, card_type, partial_pan, bank_identifier,
-                           confidence_score, scan_count, scan_timestamp, last_seen,
-                           status, admin_notes
-                    FROM nfc_card_identifiers
-                """
-                
-                params = ()
-                if status_filter:
-                    query += " WHERE status = ?"
-                    params = (status_filter,)
-                
-                query += " ORDER BY scan_count DESC, last_seen DESC"
-                
-                cursor.execute(query, params)
-                
-                columns = [desc[0] for desc in cursor.description]
-                results = []
-                
-                for row in cursor.fetchall():
-                    card_data = dict(zip(columns, row))
-                    results.append(card_data)
-                
-                export_data = {
-                    'export_timestamp': datetime.now().isoformat(),
-                    'total_cards': len(results),
-                    'status_filter': status_filter,
-                    'cards': results
-                }
-                
-                return json.dumps(export_data, indent=2, ensure_ascii=False)
-                
+            conn = self._reader()
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT id, card_hash, card_type, partial_pan, bank_identifier,
+                       confidence_score, scan_count, scan_timestamp, last_seen,
+                       status, admin_notes
+                FROM nfc_card_identifiers
+            """
+            
+            params = ()
+            if status_filter:
+                query += " WHERE status = ?"
+                params = (status_filter,)
+            
+            query += " ORDER BY scan_count DESC, last_seen DESC"
+            
+            cursor.execute(query, params)
+            
+            indent = 2 if pretty else None
+            cards = io.StringIO()
+            total_cards = 0
+            for row in cursor:
+                card = json.dumps(dict(row), indent=indent, ensure_ascii=False)
+                if pretty:
+                    # Karte um zwei Ebenen einrücken; Zeilenumbrüche in Strings sind escaped
+                    cards.write(",\n    " if total_cards else "\n    ")
+                    cards.write(card.replace("\n", "\n    "))
+                else:
+                    cards.write(", " if total_cards else "")
+                    cards.write(card)
+                total_cards += 1
+            
+            header = json.dumps({
+                'export_timestamp': datetime.now().isoformat(),
+                'total_cards': total_cards,
+                'status_filter': status_filter,
+            }, indent=indent, ensure_ascii=False)
+            
+            if pretty:
+                cards_json = f"[{cards.getvalue()}\n  ]" if total_cards else "[]"
+                return f'{header[:-2]},\n  "cards": {cards_json}\n}}'
+            return f'{header[:-1]}, "cards": [{cards.getvalue()}]}}'
+            
         except Exception as e:
             log_error(f"Fehler beim Exportieren der Kartendaten: {e}")
             return json.dumps({'error': str(e)})
 
 
-# Globale Instanz
-nfc_raw_data_analyzer = NFCRawDataAnalyzer() 
\ No newline at end of file
+# Globale Instanz - wird erst beim ersten Zugriff erzeugt, damit ein Import
+# nicht schon die Datenbank öffnet und das Schema anlegt
+_nfc_raw_data_analyzer: Optional[NFCRawDataAnalyzer] = None
+_nfc_raw_data_analyzer_lock = threading.Lock()
+
+
+def get_nfc_raw_data_analyzer() -> NFCRawDataAnalyzer:
+    """Gibt die prozessweite NFCRawDataAnalyzer-Instanz zurück (lazy erzeugt)."""
+    global _nfc_raw_data_analyzer
+    if _nfc_raw_data_analyzer is None:
+        with _nfc_raw_data_analyzer_lock:
+            if _nfc_raw_data_analyzer is None:
+                _nfc_raw_data_analyzer = NFCRawDataAnalyzer()
+    return _nfc_raw_data_analyzer
+
+
+def __getattr__(name: str):
+    # Rückwärtskompatibilität: `from ... import nfc_raw_data_analyzer`
+    if name == "nfc_raw_data_analyzer":
+        return get_nfc_raw_data_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,26 +1,95 @@
+import copy
 import json
 import os
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime, time, timedelta
-from typing import List, Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, List, Dict, Iterator, Mapping, Optional, Tuple
 from ..config import DATA_DIR
 from ..logger import log_system, log_error
 
+# orjson is considerably faster than the stdlib json (relevant on the Pi) - optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 OPENING_HOURS_FILE = os.path.join(DATA_DIR, "opening_hours.json")
 
+
+def _loads_hours(data: bytes) -> Dict:
+    """Parse opening_hours.json contents."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_hours(hours: Dict) -> bytes:
+    """Serialize the opening hours as indented UTF-8 JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(hours, option=orjson.OPT_INDENT_2)
+    return json.dumps(hours, indent=2).encode("utf-8")
+
+
+@lru_cache(maxsize=512)
+def _parse_hm(value: str) -> time:
+    """Parse an "HH:MM" string into a time object (cached; at most 1440 distinct values)."""
+    hours, minutes = value.split(":")
+    return time(int(hours), int(minutes))
+
+
+# Index matches datetime.weekday(); names are the keys of the "weekdays" config
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Compiled window for a day without usable hours: (enabled, start_minute, end_minute)
+_CLOSED_WINDOW = (False, 0, 0)
+
+
+def _compile_window(config: Dict) -> Tuple[bool, int, int]:
+    """Compile a {"enabled", "start", "end"} entry into (enabled, start_minute, end_minute)."""
+    start = _parse_hm(config.get("start", "00:00"))
+    end = _parse_hm(config.get("end", "23:59"))
+    return (bool(config.get("enabled", False)),
+            start.hour * 60 + start.minute,
+            end.hour * 60 + end.minute)
+
+
+def _within_window(start_minute: int, end_minute: int, check_time: datetime) -> bool:
+    """
+    Check start <= check_time <= end on minute-of-day values.
+
+    The end minute itself only counts at exactly :00 seconds, matching the
+    previous comparison of full time objects against HH:MM bounds.
+    """
+    minute = check_time.hour * 60 + check_time.minute
+    if minute == end_minute:
+        return start_minute <= minute and not (check_time.second or check_time.microsecond)
+    return start_minute <= minute < end_minute
+
+
 class OpeningHoursManager:
     """Manages opening hours for the access control system."""
 
     def __init__(self):
         """Initialize the OpeningHoursManager and load configuration."""
         self.hours = {}
+        self._batch_depth = 0
+        self._dirty = False
+        self._hours_view: Mapping[str, Any] = MappingProxyType(self.hours)
+        self._weekday_windows = (_CLOSED_WINDOW,) * 7
+        self._door_state = "normal"
+        self._exceptions_by_date: Dict[str, Tuple[bool, int, int]] = {}
+        self._holiday_set: frozenset = frozenset()
         self._load_hours()
 
     def _load_hours(self) -> None:
         """Load opening hours from the JSON file."""
         try:
             if os.path.exists(OPENING_HOURS_FILE):
-                with open(OPENING_HOURS_FILE, 'r') as f:
-                    self.hours = json.load(f)
+                with open(OPENING_HOURS_FILE, 'rb') as f:
+                    self.hours = _loads_hours(f.read())
                 log_system("Opening hours configuration loaded successfully")
             else:
                 # Default configuration: 24/7 access
@@ -45,13 +114,93 @@ class OpeningHoursManager:
         except Exception as e:
             log_error(f"Error loading opening hours: {str(e)}")
             self.hours = {"enabled": False, "default_access": True}
+        self._recompile()
+
+    def _recompile(self) -> None:
+        """
+        Precompute the schedule used by is_access_allowed.
+
+        Must run after every change to self.hours so the access check never
+        has to parse time strings itself.
+        """
+        # The view follows in-place changes; only a reload rebinds self.hours
+        self._hours_view = MappingProxyType(self.hours)
+        self._door_state = self.hours.get("door_state", "normal")
+        self._rebuild_holiday_set()
+
+        weekdays = self.hours.get("weekdays", {})
+        windows = []
+        for name in _WEEKDAYS:
+            try:
+                windows.append(_compile_window(weekdays.get(name, {})))
+            except (ValueError, TypeError, AttributeError) as e:
+                # Fail closed: an unreadable day denies access instead of raising on every scan
+                log_error(f"Invalid opening hours for {name}: {str(e)}")
+                windows.append(_CLOSED_WINDOW)
+        self._weekday_windows = tuple(windows)
+
+        # Exceptions stay a list on disk; the first entry per date wins as in the old scan
+        exceptions_by_date = {}
+        for exception in self.hours.get("exceptions", []):
+            try:
+                date_str = exception.get("date")
+            except AttributeError:
+                continue
+            if date_str not in exceptions_by_date:
+                exceptions_by_date[date_str] = self._compile_exception(exception)
+        self._exceptions_by_date = exceptions_by_date
+
+    def _rebuild_holiday_set(self) -> None:
+        """Refresh the holiday lookup set from the holidays list."""
+        # Only strings can match a checked date; anything else would just be unhashable
+        self._holiday_set = frozenset(
+            h for h in self.hours.get("holidays", []) if isinstance(h, str)
+        )
+
+    @staticmethod
+    def _compile_exception(exception: Dict) -> Tuple[bool, int, int]:
+        """Compile one exception entry; an unreadable entry counts as a closure."""
+        try:
+            return _compile_window(exception)
+        except (ValueError, TypeError, AttributeError) as e:
+            log_error(f"Invalid exception hours for {exception.get('date')}: {str(e)}")
+            return _CLOSED_WINDOW
+
+    @contextmanager
+    def batch(self) -> Iterator["OpeningHoursManager"]:
+        """
+        Group several changes into a single write of the JSON file.
+
+        Inside the block _save_hours only marks the configuration dirty;
+        leaving the outermost block writes it once, also after an error so
+        the file matches what is already in memory.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self._save_hours()
 
     def _save_hours(self) -> bool:
-        """Save opening hours to the JSON file."""
+        """Save opening hours to the JSON file (deferred while a batch() is open)."""
+        if self._batch_depth:
+            self._dirty = True
+            return True
         try:
             os.makedirs(os.path.dirname(OPENING_HOURS_FILE), exist_ok=True)
-            with open(OPENING_HOURS_FILE, 'w') as f:
-                json.dump(self.hours, f, indent=2)
+            payload = _dumps_hours(self.hours)
+
+            # Temporary file + a single write(), then an atomic rename - a power
+            # loss never leaves a half-written configuration behind
+            temp_file = OPENING_HOURS_FILE + '.tmp'
+            with open(temp_file, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, OPENING_HOURS_FILE)
+            self._dirty = False
             log_system("Opening hours configuration saved successfully")
             return True
         except Exception as e:
@@ -65,7 +214,7 @@ class OpeningHoursManager:
         Returns:
             String: "always_open", "normal", or "always_closed"
         """
-        return self.hours.get("door_state", "normal")
+        return self._door_state
 
     def set_door_state(self, state: str) -> bool:
         """
@@ -84,6 +233,7 @@ class OpeningHoursManager:
 
         try:
             self.hours["door_state"] = state
+            self._door_state = state
             self._save_hours()
             log_system(f"Door state updated to: {state}")
 
@@ -154,40 +304,33 @@ class OpeningHoursManager:
 
         # Check if it's a holiday
         date_str = check_time.date().isoformat()
-        if date_str in self.hours.get("holidays", []):
+        if date_str in self._holiday_set:
             return (False, "Access denied: Holiday")
 
         # Check for exceptions (special dates with different hours)
-        exceptions = self.hours.get("exceptions", [])
-        for exception in exceptions:
-            if exception.get("date") == date_str:
-                if not exception.get("enabled", False):
-                    return (False, f"Access denied: Special closure on {date_str}")
-
-                start_time = datetime.strptime(exception.get("start", "00:00"), "%H:%M").time()
-                end_time = datetime.strptime(exception.get("end", "23:59"), "%H:%M").time()
-                current_time = check_time.time()
-
-                if start_time <= current_time <= end_time:
-                    return (True, f"Access allowed: Special hours on {date_str}")
-                else:
-                    return (False, f"Outside special hours for {date_str}")
+        exception = self._exceptions_by_date.get(date_str)
+        if exception is not None:
+            enabled, start_minute, end_minute = exception
+            if not enabled:
+                return (False, f"Access denied: Special closure on {date_str}")
+
+            if _within_window(start_minute, end_minute, check_time):
+                return (True, f"Access allowed: Special hours on {date_str}")
+            else:
+                return (False, f"Outside special hours for {date_str}")
 
         # Check regular weekday hours
-        weekday = check_time.strftime("%A").lower()
-        day_config = self.hours.get("weekdays", {}).get(weekday, {})
-
-        if not day_config.get("enabled", False):
-            return (False, f"Access denied: Closed on {weekday.capitalize()}")
+        weekday = check_time.weekday()
+        enabled, start_minute, end_minute = self._weekday_windows[weekday]
+        day_name = _WEEKDAYS[weekday].capitalize()
 
-        start_time = datetime.strptime(day_config.get("start", "00:00"), "%H:%M").time()
-        end_time = datetime.strptime(day_config.get("end", "23:59"), "%H:%M").time()
-        current_time = check_time.time()
+        if not enabled:
+            return (False, f"Access denied: Closed on {day_name}")
 
-        if start_time <= current_time <= end_time:
-            return (True, f"Access allowed: Within {weekday.capitalize()} hours")
+        if _within_window(start_minute, end_minute, check_time):
+            return (True, f"Access allowed: Within {day_name} hours")
         else:
-            return (False, f"Outside operating hours for {weekday.capitalize()}")
+            return (False, f"Outside operating hours for {day_name}")
 
     def update_hours(self, config: Dict) -> bool:
         """
@@ -201,6 +344,7 @@ class OpeningHoursManager:
         """
         try:
             self.hours.update(config)
+            self._recompile()
             self._save_hours()
             log_system("Opening hours updated successfully")
             return True
@@ -208,9 +352,19 @@ class OpeningHoursManager:
             log_error(f"Error updating opening hours: {str(e)}")
             return False
 
-    def get_hours(self) -> Dict:
-        """Get the current opening hours configuration."""
-        return self.hours.copy()
+    def get_hours(self) -> Mapping[str, Any]:
+        """
+        Get a read-only view of the current opening hours configuration.
+
+        The view is live and not copied. Changes go through update_hours and
+        the holiday/exception methods, never through nested values of the
+        view; use snapshot() for an independent copy.
+        """
+        return self._hours_view
+
+    def snapshot(self) -> Dict:
+        """Get an independent deep copy of the opening hours configuration."""
+        return copy.deepcopy(self.hours)
 
     def add_holiday(self, date_str: str) -> bool:
         """
@@ -226,8 +380,9 @@ class OpeningHoursManager:
             if "holidays" not in self.hours:
                 self.hours["holidays"] = []
 
-            if date_str not in self.hours["holidays"]:
+            if date_str not in self._holiday_set:
                 self.hours["holidays"].append(date_str)
+                self._rebuild_holiday_set()
                 self._save_hours()
                 log_system(f"Holiday added: {date_str}")
                 return True
@@ -247,8 +402,9 @@ class OpeningHoursManager:
             True if successful, False otherwise
         """
         try:
-            if "holidays" in self.hours and date_str in self.hours["holidays"]:
+            if date_str in self._holiday_set:
                 self.hours["holidays"].remove(date_str)
+                self._rebuild_holiday_set()
                 self._save_hours()
                 log_system(f"Holiday removed: {date_str}")
                 return True
@@ -275,18 +431,21 @@ class OpeningHoursManager:
                 self.hours["exceptions"] = []
 
             # Remove existing exception for this date
-            self.hours["exceptions"] = [
-                e for e in self.hours["exceptions"]
-                if e.get("date") != date_str
-            ]
+            if date_str in self._exceptions_by_date:
+                self.hours["exceptions"] = [
+                    e for e in self.hours["exceptions"]
+                    if e.get("date") != date_str
+                ]
 
             # Add new exception
-            self.hours["exceptions"].append({
+            exception = {
                 "date": date_str,
                 "enabled": enabled,
                 "start": start,
                 "end": end
-            })
+            }
+            self.hours["exceptions"].append(exception)
+            self._exceptions_by_date[date_str] = self._compile_exception(exception)
 
             self._save_hours()
             log_system(f"Exception added for {date_str}")
@@ -306,17 +465,16 @@ class OpeningHoursManager:
             True if successful, False otherwise
         """
         try:
-            if "exceptions" in self.hours:
-                original_length = len(self.hours["exceptions"])
+            if date_str in self._exceptions_by_date:
                 self.hours["exceptions"] = [
                     e for e in self.hours["exceptions"]
                     if e.get("date") != date_str
                 ]
+                del self._exceptions_by_date[date_str]
 
-                if len(self.hours["exceptions"]) < original_length:
-                    self._save_hours()
-                    log_system(f"Exception removed for {date_str}")
-                    return True
+                self._save_hours()
+                log_system(f"Exception removed for {date_str}")
+                return True
             return False
         except Exception as e:
             log_error(f"Error removing exception: {str(e)}")
@@ -714,7 +714,7 @@ def handle_card_scan(card_data):
         
         # Enhanced NFC Raw Data Analysis für fehlgeschlagene Scan-Verarbeitung
         try:
-            from app.models.nfc_raw_data_analyzer import nfc_raw_data_analyzer
+            from app.models.nfc_raw_data_analyzer import get_nfc_raw_data_analyzer
             
             # Sammle verfügbare Daten für die Analyse
             apdu_responses = []
@@ -740,7 +740,7 @@ def handle_card_scan(card_data):
                 'error_message': str(e)[:500]
             })
             
-            session_id = nfc_raw_data_analyzer.analyze_and_store_nfc_scan(
+            session_id = get_nfc_raw_data_analyzer().analyze_and_store_nfc_scan(
                 card_type=card_type_str,
                 apdu_responses=apdu_responses,
                 atr_data=atr_data,
@@ -1076,7 +1076,7 @@ def parse_apdu(data):
         
         # Enhanced NFC Raw Data Analysis für APDU-Parsing-Fehler
         try:
-            from app.models.nfc_raw_data_analyzer import nfc_raw_data_analyzer
+            from app.models.nfc_raw_data_analyzer import get_nfc_raw_data_analyzer
             
             raw_data_hex = data.hex() if hasattr(data, 'hex') else str(data)
             
@@ -1091,7 +1091,7 @@ def parse_apdu(data):
                 'error_message': str(e)[:500]
             }]
             
-            session_id = nfc_raw_data_analyzer.analyze_and_store_nfc_scan(
+            session_id = get_nfc_raw_data_analyzer().analyze_and_store_nfc_scan(
                 card_type="parse_apdu_error",
                 apdu_responses=apdu_responses,
                 analysis_notes=f"APDU-Parsing-Fehler: {str(e)}"
@@ -4089,7 +4089,7 @@ def get_nfc_status():
 
 # Import für fehlgeschlagene Scan-Speicherung
 try:
-    from .models.failed_nfc_scan import failed_scan_manager
+    from .models.failed_nfc_scan import get_failed_scan_manager
     FAILED_SCAN_STORAGE_AVAILABLE = True
     logger.info("✅ Failed NFC Scan Storage verfügbar")
 except ImportError as e:
@@ -4164,9 +4164,9 @@ def save_failed_scan_data(card_type, apdu_responses, atr_data=None, uid_data=Non
         
         # Verwende das erweiterte NFC Raw Data Analysis System
         try:
-            from app.models.nfc_raw_data_analyzer import nfc_raw_data_analyzer
+            from app.models.nfc_raw_data_analyzer import get_nfc_raw_data_analyzer
             
-            session_id = nfc_raw_data_analyzer.analyze_and_store_nfc_scan(
+            session_id = get_nfc_raw_data_analyzer().analyze_and_store_nfc_scan(
                 card_type=card_type,
                 apdu_responses=apdu_responses,
                 atr_data=atr_data,
@@ -4182,7 +4182,7 @@ def save_failed_scan_data(card_type, apdu_responses, atr_data=None, uid_data=Non
             session_id = None
         
         # Fallback: Verwende auch das alte Datenbankmodell
-        scan_id = failed_scan_manager.save_failed_scan(
+        scan_id = get_failed_scan_manager().save_failed_scan(
             card_type=card_type,
             apdu_responses=apdu_responses,
             atr_data=atr_data,
@@ -4264,7 +4264,7 @@ def _add_automatic_analysis(scan_id, card_type, apdu_responses):
         recommendation_text = " | ".join(recommendations) if recommendations else "Weitere Analyse erforderlich."
         
         # Füge Analyse zur Datenbank hinzu
-        failed_scan_manager.add_analysis_result(
+        get_failed_scan_manager().add_analysis_result(
             scan_id=scan_id,
             analysis_type="automatic_pattern_analysis",
             result=error_analysis,
@@ -2922,7 +2922,7 @@ def nfc_card_action():
     Führt eine Aktion auf einer NFC-Karte aus (approve/reject/note).
     """
     try:
-        from app.models.nfc_raw_data_analyzer import nfc_raw_data_analyzer
+        from app.models.nfc_raw_data_analyzer import get_nfc_raw_data_analyzer
         
         card_id = request.form.get('card_id', type=int)
         action = request.form.get('action')
@@ -2933,21 +2933,21 @@ def nfc_card_action():
             return redirect(url_for('routes.fallback_log'))
         
         if action == 'approve':
-            success = nfc_raw_data_analyzer.update_card_status(card_id, 'approved', admin_notes)
+            success = get_nfc_raw_data_analyzer().update_card_status(card_id, 'approved', admin_notes)
             if success:
                 flash('Karte wurde genehmigt', 'success')
             else:
                 flash('Fehler beim Genehmigen der Karte', 'error')
                 
         elif action == 'reject':
-            success = nfc_raw_data_analyzer.update_card_status(card_id, 'rejected', admin_notes)  
+            success = get_nfc_raw_data_analyzer().update_card_status(card_id, 'rejected', admin_notes)  
             if success:
                 flash('Karte wurde abgelehnt', 'success')
             else:
                 flash('Fehler beim Ablehnen der Karte', 'error')
                 
         elif action == 'add_note':
-            success = nfc_raw_data_analyzer.update_card_status(card_id, 'unknown', admin_notes)
+            success = get_nfc_raw_data_analyzer().update_card_status(card_id, 'unknown', admin_notes)
             if success:
                 flash('Notiz hinzugefügt', 'success')
             else:
@@ -2969,13 +2969,13 @@ def nfc_card_details_api():
     API-Endpoint für AJAX-Loading der Kartendetails.
     """
     try:
-        from app.models.nfc_raw_data_analyzer import nfc_raw_data_analyzer
+        from app.models.nfc_raw_data_analyzer import get_nfc_raw_data_analyzer
         
         card_id = request.args.get('card_id', type=int)
         if not card_id:
             return jsonify({'success': False, 'error': 'Keine Karten-ID angegeben'})
         
-        card_data = nfc_raw_data_analyzer.get_card_details(card_id)
+        card_data = get_nfc_raw_data_analyzer().get_card_details(card_id)
         if not card_data:
             return jsonify({'success': False, 'error': 'Karte nicht gefunden'})
         
@@ -2995,10 +2995,10 @@ def nfc_export():
     Exportiert NFC-Kartendaten als JSON.
     """
     try:
-        from app.models.nfc_raw_data_analyzer import nfc_raw_data_analyzer
+        from app.models.nfc_raw_data_analyzer import get_nfc_raw_data_analyzer
         
         status_filter = request.args.get('status')
-        export_data = nfc_raw_data_analyzer.export_card_data(status_filter)
+        export_data = get_nfc_raw_data_analyzer().export_card_data(status_filter)
         
         filename = f"nfc_cards_{status_filter or 'all'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
@@ -3025,7 +3025,7 @@ def fallback_log():
     """
     try:
         from app import error_logger
-        from app.models.nfc_raw_data_analyzer import nfc_raw_data_analyzer
+        from app.models.nfc_raw_data_analyzer import get_nfc_raw_data_analyzer
         
         # Hole Legacy Error-Logs
         logs = error_logger.get_fallback_logs(limit=50)
@@ -3037,18 +3037,16 @@ def fallback_log():
         nfc_stats = {}
         
         try:
-            # Hole alle Karten (alle Status)
-            all_cards = nfc_raw_data_analyzer.get_all_cards(limit=100)
-            nfc_cards = all_cards[:50]  # Begrenze auf 50 für Performance
-            
-            # Berechne NFC-Statistiken
-            nfc_stats = {
-                'total_unknown': len([c for c in all_cards if c['status'] == 'unknown']),
-                'high_confidence': len([c for c in all_cards if c['confidence_score'] > 0.7]),
-                'frequent_scans': len([c for c in all_cards if c['scan_count'] > 3]),
-                'recent_scans': len([c for c in all_cards if 
-                                   (datetime.now() - datetime.fromisoformat(c['last_seen'])).days < 7])
-            }
+            # Hole alle Karten (alle Status) und berechne die NFC-Statistiken in einem Durchlauf
+            nfc_stats = {'total_unknown': 0, 'high_confidence': 0, 'frequent_scans': 0, 'recent_scans': 0}
+            now = datetime.now()
+            for c in get_nfc_raw_data_analyzer().get_all_cards(limit=100):
+                if len(nfc_cards) < 50:  # Begrenze auf 50 für Performance
+                    nfc_cards.append(c)
+                nfc_stats['total_unknown'] += c['status'] == 'unknown'
+                nfc_stats['high_confidence'] += c['confidence_score'] > 0.7
+                nfc_stats['frequent_scans'] += c['scan_count'] > 3
+                nfc_stats['recent_scans'] += (now - datetime.fromisoformat(c['last_seen'])).days < 7
         except Exception as nfc_err:
             logger.debug(f"NFC-Daten konnten nicht geladen werden: {nfc_err}")
             nfc_stats = {'total_unknown': 0, 'high_confidence': 0, 'frequent_scans': 0, 'recent_scans': 0}
@@ -3686,7 +3684,7 @@ def get_door_control_config():
     try:
         from app.models.door_control_simple import simple_door_control_manager as door_control_manager
 
-        config = door_control_manager.get_config()
+        config = door_control_manager.get_config_copy()
 
         logger.info("Door control configuration requested")
         return jsonify({
@@ -3744,8 +3742,8 @@ def update_door_control_config():
             flash("Keine Konfigurationsdaten empfangen", "error")
             return redirect(url_for('routes.opening_hours'))
 
-        # Get previous config for logging
-        previous_config = door_control_manager.get_config()
+        # Get previous config for logging (a snapshot - get_config() is a live view)
+        previous_config = door_control_manager.get_config_copy()
 
         success = door_control_manager.update_config(data)
 
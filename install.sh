@@ -309,7 +309,7 @@ if [ -f "requirements.txt" ]; then
     pip install sd-notify > /dev/null 2>&1
 else
     # Installiere alle erforderlichen Pakete für das Fallback-Logging-System
-    pip install flask werkzeug waitress gunicorn pyscard requests psutil gpiozero lgpio jinja2 pytz sd-notify > /dev/null 2>&1
+    pip install flask werkzeug waitress gunicorn pyscard requests psutil gpiozero lgpio jinja2 pytz sd-notify orjson pyroute2 > /dev/null 2>&1
 fi
 
 # HINZUGEFÜGT: Pi 5 spezifische GPIO-Bibliotheken installieren
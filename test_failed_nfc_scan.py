@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the failed NFC scan database (app/models/failed_nfc_scan.py):
+1. get_scan_statistics returns the basic statistics row
+2. export_scan_data finds any scan by its id, not only the newest one
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.models import failed_nfc_scan
+
+TEST_DATA_DIR = tempfile.mkdtemp(prefix="failed_nfc_scan_test_")
+
+APDU_RESPONSES = [
+    {"command": "select_visa", "apdu": "00 A4 04 00 07 A0 00 00 00 03 10 10",
+     "response": "6A 82", "sw1": "6A", "sw2": "82", "success": False},
+    {"command": "get_processing_options", "apdu": "80 A8 00 00 02 83 00",
+     "response": "77 0A 82 02 19 80 90 00", "sw1": "90", "sw2": "00", "success": True},
+]
+
+
+def _new_manager():
+    """Create a manager whose databases live in a fresh temporary DATA_DIR."""
+    failed_nfc_scan.DATA_DIR = tempfile.mkdtemp(dir=TEST_DATA_DIR)
+    return failed_nfc_scan.FailedNFCScanManager()
+
+
+def test_scan_statistics_basic():
+    """basic_statistics must contain the aggregate row (fetchone was called twice)."""
+    manager = _new_manager()
+    try:
+        manager.save_failed_scan("visa", APDU_RESPONSES, "3B 8F 80 01", "04 AA BB")
+        manager.save_failed_scan("mastercard", APDU_RESPONSES[:1], "3B 8F 80 01", "04 AA BC")
+
+        basic = manager.get_scan_statistics()["basic_statistics"]
+        assert basic, "basic_statistics is empty"
+        assert basic["total_failed_scans"] == 2
+        assert basic["unique_card_types"] == 2
+        assert abs(basic["avg_success_rate"] - 0.25) < 1e-9
+        print("✓ get_scan_statistics returns the basic statistics row")
+    finally:
+        manager.shutdown()
+
+
+def test_export_scan_by_id():
+    """export_scan_data must find older scans (it used to search only the newest scan)."""
+    manager = _new_manager()
+    try:
+        first_id = manager.save_failed_scan("visa", APDU_RESPONSES, "3B 8F 80 01", "04 AA BB")
+        second_id = manager.save_failed_scan("mastercard", APDU_RESPONSES[:1], "3B 8F 80 02", "04 AA BC")
+        assert first_id is not None and second_id is not None
+
+        exported = manager.export_scan_data(first_id)
+        assert exported is not None, "older scan could not be exported"
+        scan = json.loads(exported)
+        assert scan["id"] == first_id
+        assert scan["card_type"] == "visa"
+        assert scan["raw_atr_data"] == "3B 8F 80 01"
+        assert [r["command_name"] for r in scan["apdu_responses"]] == ["select_visa", "get_processing_options"]
+
+        csv_lines = manager.export_scan_data(second_id, format="csv").splitlines()
+        assert len(csv_lines) == 2
+        assert csv_lines[1].startswith("0,select_visa,00 A4 04 00 07 A0 00 00 00 03 10 10,6A 82,6A,82,")
+
+        assert manager.export_scan_data(second_id + 1000) is None
+        print("✓ export_scan_data looks up scans by id (JSON and CSV)")
+    finally:
+        manager.shutdown()
+
+
+TESTS = [test_scan_statistics_basic, test_export_scan_by_id]
+
+
+def main():
+    print("=" * 60)
+    print(" FAILED NFC SCAN DATABASE TESTS")
+    print("=" * 60)
+
+    all_passed = True
+    for test in TESTS:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"✗ {test.__name__}: {e}")
+            all_passed = False
+
+    print("✅ ALL TESTS PASSED!" if all_passed else "⚠️ SOME TESTS FAILED!")
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())